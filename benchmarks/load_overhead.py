@@ -0,0 +1,80 @@
+# benchmarks/load_overhead.py
+#
+# Micro-benchmarks for `marmot.load`, reporting the time spent in marmot itself
+# separately from the time spent constructing the model.
+#
+#   python benchmarks/load_overhead.py [--number 10000] [--repeat 5]
+
+import argparse
+import logging
+import timeit
+from typing import Callable
+
+import marmot
+from marmot.model.registration import _find_spec
+
+
+class NoopModel(marmot.Model[float, float]):
+    _id = "benchmark/noop-v1"
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__()
+
+    @property
+    def dummy_input(self) -> float:
+        return 0.0
+
+    @property
+    def dummy_output(self) -> float:
+        return 0.0
+
+    def get_output(self, x: float) -> float:
+        return x
+
+
+def create_noop_model(**kwargs) -> NoopModel:
+    return NoopModel(**kwargs)
+
+
+def _register_benchmark_models() -> None:
+    marmot.register("benchmark/noop-v1", create_noop_model)
+    marmot.register("benchmark/noop-kwargs-v1", create_noop_model, {"a": [1, 2, 3]})
+    marmot.register("benchmark/noop-entry-point-v1", f"{__name__}:create_noop_model")
+
+
+def _best_per_call(stmt: Callable, number: int, repeat: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    _register_benchmark_models()
+
+    construction = _best_per_call(create_noop_model, args.number, args.repeat)
+
+    cases: dict[str, Callable] = {
+        "load(versioned id)": lambda: marmot.load("benchmark/noop-v1"),
+        "load(unversioned id)": lambda: marmot.load("benchmark/noop"),
+        "load(spec kwargs)": lambda: marmot.load("benchmark/noop-kwargs-v1"),
+        "load(string entry point)": lambda: marmot.load(
+            "benchmark/noop-entry-point-v1"
+        ),
+        "load(ModelSpec)": lambda spec=_find_spec("benchmark/noop-v1"): marmot.load(
+            spec
+        ),
+    }
+
+    print(f"{'case':<28} {'total (us)':>12} {'overhead (us)':>14}")
+    print(f"{'model construction':<28} {construction * 1e6:12.2f} {'-':>14}")
+    for name, stmt in cases.items():
+        total = _best_per_call(stmt, args.number, args.repeat)
+        print(f"{name:<28} {total * 1e6:12.2f} {(total - construction) * 1e6:14.2f}")
+
+
+if __name__ == "__main__":
+    main()
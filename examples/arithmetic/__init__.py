@@ -4,3 +4,4 @@ from .main import *
 
 BatchMean.register_model()
 RecursiveMean.register_model()
+MeanComparison.register_model()
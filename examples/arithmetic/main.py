@@ -1,7 +1,8 @@
 # project_name/main.py
 
-from typing import Sequence
+from typing import Sequence, Tuple
 
+from marmot import Node, Pipeline
 from marmot.base_models.arithmetic import MeanModel
 
 
@@ -22,11 +23,28 @@ class RecursiveMean(MeanModel):
         super().__init__()
 
     def get_output(self, x: Sequence[float]) -> float:
-        cur_mean = 0.0
-        cur_k = 0
+        return self.finalize(self.update(self.init_state(), x))
+
+    # The running mean and the number of items seen so far
+    def init_state(self) -> Tuple[float, int]:
+        return 0.0, 0
+
+    def update(self, state: Tuple[float, int], x: Sequence[float]) -> Tuple[float, int]:
+        cur_mean, cur_k = state
 
         for item in x:
             cur_mean = (cur_k * cur_mean + item) / (cur_k + 1)
             cur_k += 1
 
-        return cur_mean
+        return cur_mean, cur_k
+
+    def finalize(self, state: Tuple[float, int]) -> float:
+        return state[0]
+
+
+class MeanComparison(Pipeline):
+    _id = "mean-comparison-v1"
+
+    # Both means are computed concurrently from the same input
+    _nodes = {"batch": Node("mean-v1"), "recursive": Node("mean-v2")}
+    _outputs = ("batch", "recursive")
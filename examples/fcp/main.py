@@ -1,9 +1,8 @@
 # project_name/main.py
 
-from pathlib import Path
-
 import torch
 
+from marmot import open_asset
 from marmot.base_models.fuel_consumption import DailyFuelConsumptionModel, NoonReport
 
 
@@ -13,7 +12,8 @@ class FuelConsumptionModel1(DailyFuelConsumptionModel):
     def __init__(self):
         super().__init__()
 
-        self.model = torch.load(Path(__file__).parent / "model1.pt")
+        with open_asset(__package__, "model1.pt") as f:
+            self.model = torch.load(f)
 
     def get_output(self, x: NoonReport) -> float:
         return self.model(torch.Tensor([x.length, x.width]))
@@ -25,7 +25,8 @@ class FuelConsumptionModel2(DailyFuelConsumptionModel):
     def __init__(self):
         super().__init__()
 
-        self.model = torch.load(Path(__file__).parent / "model2.pt")
+        with open_asset(__package__, "model2.pt") as f:
+            self.model = torch.load(f)
 
     def get_output(self, x: NoonReport) -> float:
         return self.model(torch.Tensor([x.length, x.width]))
@@ -1,2 +1,5 @@
+from .model.assets import map_asset, open_asset
+from .model.concurrency import ConcurrencyMode
 from .model.core import Model, NotImplementedException
-from .model.registration import load, register
+from .model.pipeline import Node, Pipeline
+from .model.registration import load, load_shared, register
@@ -1,2 +1,9 @@
+from .model.assets import map_asset as map_asset, open_asset as open_asset
+from .model.concurrency import ConcurrencyMode as ConcurrencyMode
 from .core import Model as Model, NotImplementedException as NotImplementedException
-from .model.registration import load as load, register as register
+from .model.pipeline import Node as Node, Pipeline as Pipeline
+from .model.registration import (
+    load as load,
+    load_shared as load_shared,
+    register as register,
+)
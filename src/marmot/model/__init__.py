@@ -1,2 +1,6 @@
-from .core import Model, NotImplementedException
+from .assets import map_asset, open_asset
+from .concurrency import ConcurrencyMode, ThreadLocalModel
+from .core import Model, NotImplementedException, WarmupReport
+from .limits import ModelMemoryError, ModelTimeoutError, call_with_limits
+from .pipeline import Node, Pipeline
 from .registration import get_available_models
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import importlib
+import mmap
+import struct
+import zipfile
+import zipimport
+from pathlib import Path
+from typing import BinaryIO, Union
+
+# Length of the fixed part of a zip local file header and the offset of its
+# file name length field
+_LOCAL_HEADER_SIZE = 30
+_LOCAL_HEADER_NAME_LENGTH = 26
+
+# Memory maps are kept open so that views into them remain valid. Downloaded archives
+# are never rewritten (every version has a file of its own), so maps never go stale
+_mapped_files: dict[str, mmap.mmap] = {}
+
+
+def _locate(package: str, name: str) -> tuple[Union[str, None], str]:
+    """Returns `(archive, member)` for zip-imported packages and `(None, path)`
+    otherwise."""
+    module = importlib.import_module(package)
+    spec = module.__spec__
+    assert spec is not None and spec.submodule_search_locations is not None
+
+    location = spec.submodule_search_locations[0]
+
+    if isinstance(spec.loader, zipimport.zipimporter):
+        archive = spec.loader.archive
+        member = "/".join(filter(None, [location[len(archive) + 1 :], name]))
+        return archive, member.replace("\\", "/")
+
+    return None, str(Path(location) / name)
+
+
+def _map_file(filename: str) -> mmap.mmap:
+    mapped = _mapped_files.get(filename)
+    if mapped is None:
+        with open(filename, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _mapped_files[filename] = mapped
+
+    return mapped
+
+
+def open_asset(package: str, name: str) -> BinaryIO:
+    """Opens the file `name` shipped with the model package `package` for reading.
+
+    Works for packages on disk as well as packages imported from their archive, in
+    which case the member is read lazily from the archive. Use it as a context
+    manager so that the file is closed once read.
+    """
+    archive, member = _locate(package, name)
+    if archive is None:
+        return open(member, "rb")
+
+    # The member keeps the archive file open until it is closed itself
+    with zipfile.ZipFile(archive) as zf:
+        return zf.open(member)  # type: ignore
+
+
+def map_asset(package: str, name: str) -> memoryview:
+    """Returns a read-only, memory-mapped view of the file `name` shipped with the
+    model package `package`.
+
+    Uncompressed archive members are mapped in place; compressed members are read
+    into memory instead.
+    """
+    archive, member = _locate(package, name)
+    if archive is None:
+        return memoryview(_map_file(member))
+
+    with zipfile.ZipFile(archive) as zf:
+        info = zf.getinfo(member)
+        if info.compress_type != zipfile.ZIP_STORED:
+            return memoryview(zf.read(info))
+
+    mapped = _map_file(archive)
+    header = info.header_offset
+    name_length, extra_length = struct.unpack_from(
+        "<HH", mapped, header + _LOCAL_HEADER_NAME_LENGTH
+    )
+    start = header + _LOCAL_HEADER_SIZE + name_length + extra_length
+
+    return memoryview(mapped)[start : start + info.file_size]
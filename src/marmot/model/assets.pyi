@@ -0,0 +1,4 @@
+from typing import BinaryIO
+
+def open_asset(package: str, name: str) -> BinaryIO: ...
+def map_asset(package: str, name: str) -> memoryview: ...
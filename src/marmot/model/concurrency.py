@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from .core import Model
+
+
+class ConcurrencyMode(str, Enum):
+    # `get_output` may be called from several threads at once
+    REENTRANT = "reentrant"
+
+    # one instance may be shared, but calls to it have to be serialised
+    NEEDS_LOCK = "needs-lock"
+
+    # every thread needs an instance of its own
+    PER_THREAD = "per-thread-instance"
+
+
+class ThreadLocalModel:
+    """Shares a per-thread-instance model between threads.
+
+    Each thread transparently gets its own model instance, created through `factory`
+    on first use. Attribute access and calls are forwarded to that instance. Only the
+    owning thread keeps its instance alive, so instances of finished threads are freed.
+    """
+
+    def __init__(self, factory: Callable[[], Model], model: Model) -> None:
+        self._factory = factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._instances: list[weakref.ref[Model]] = []
+
+        self._adopt(model)
+
+    def _adopt(self, model: Model) -> Model:
+        self._local.model = model
+        with self._lock:
+            self._instances = [ref for ref in self._instances if ref() is not None]
+            self._instances.append(weakref.ref(model))
+
+        return model
+
+    @property
+    def instances(self) -> list[Model]:
+        with self._lock:
+            return [model for ref in self._instances if (model := ref()) is not None]
+
+    @property
+    def model(self) -> Model:
+        model = getattr(self._local, "model", None)
+        if model is None:
+            model = self._adopt(self._factory())
+
+        return model
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.model(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes not found on the wrapper itself
+        if name in ("_factory", "_local", "_lock", "_instances"):
+            raise AttributeError(name)
+
+        return getattr(self.model, name)
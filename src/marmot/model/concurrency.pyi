@@ -0,0 +1,18 @@
+from enum import Enum
+from typing import Any, Callable
+
+from .core import Model
+
+class ConcurrencyMode(str, Enum):
+    REENTRANT: str
+    NEEDS_LOCK: str
+    PER_THREAD: str
+
+class ThreadLocalModel:
+    def __init__(self, factory: Callable[[], Model], model: Model) -> None: ...
+    @property
+    def instances(self) -> list[Model]: ...
+    @property
+    def model(self) -> Model: ...
+    def __call__(self, *args: Any, **kwargs: Any) -> Any: ...
+    def __getattr__(self, name: str) -> Any: ...
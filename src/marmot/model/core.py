@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import contextlib
+import functools
+import pickle
+import statistics
+import threading
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Any, Generic, TypeVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generic, Iterable, Iterator, Optional, TypeVar
 
+from ..tracing import span
+from .concurrency import ConcurrencyMode
+from .limits import call_with_limits
 from .registration import register
 
 
@@ -16,6 +25,37 @@ class ModelMetadata:
     id: str
 
 
+@dataclass
+class WarmupReport:
+    # latency of every warm-up call, in seconds
+    latencies: list[float] = field(default_factory=list)
+
+    # whether the latency settled within tolerance before `max_iterations`
+    stabilized: bool = False
+
+    # number of trailing latencies used to decide stability
+    window: int = 3
+
+    @property
+    def iterations(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def first_latency(self) -> Optional[float]:
+        return self.latencies[0] if self.latencies else None
+
+    @property
+    def stable_latency(self) -> Optional[float]:
+        if not self.latencies:
+            return None
+
+        return statistics.median(self.latencies[-self.window :])
+
+    @property
+    def total_time(self) -> float:
+        return sum(self.latencies)
+
+
 I = TypeVar("I")
 O = TypeVar("O")
 
@@ -23,8 +63,41 @@ O = TypeVar("O")
 class Model(ABC, Generic[I, O]):
     _id: str
 
+    # Whether `get_output` may be called from several threads, see `ConcurrencyMode`
+    _concurrency: ConcurrencyMode = ConcurrencyMode.NEEDS_LOCK
+
     def __init__(self) -> None:
         self.metadata = ModelMetadata(self._id)
+        self.warmup_report: Optional[WarmupReport] = None
+
+    # Locks cannot be pickled or copied, every copy of a model gets a lock of its own
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.pop("_call_lock", None)
+        return state
+
+    @property
+    def _call_lock(self) -> Optional[threading.RLock]:
+        # Created on first use so that models that skip `super().__init__()` are
+        # locked too. `setdefault` is atomic, concurrent first calls share one lock
+        try:
+            return self.__dict__["_call_lock"]
+        except KeyError:
+            lock = (
+                threading.RLock()
+                if self.concurrency is ConcurrencyMode.NEEDS_LOCK
+                else None
+            )
+            return self.__dict__.setdefault("_call_lock", lock)
+
+    @property
+    def concurrency(self) -> ConcurrencyMode:
+        return ConcurrencyMode(self._concurrency)
+
+    @property
+    def is_ready(self) -> bool:
+        report = getattr(self, "warmup_report", None)
+        return report is not None and report.stabilized
 
     @property
     @abstractmethod
@@ -40,6 +113,69 @@ class Model(ABC, Generic[I, O]):
     def get_output(self, *args: Any, **kwargs: Any) -> O:
         pass
 
+    # Optional streaming contract: models that can be evaluated incrementally implement
+    # `init_state`, `update` and `finalize`. `update` returns the new state after
+    # consuming a chunk of input and `finalize` must not modify the state it is given.
+    def init_state(self) -> Any:
+        raise NotImplementedException
+
+    def update(self, state: Any, chunk: I) -> Any:
+        raise NotImplementedException
+
+    def finalize(self, state: Any) -> O:
+        raise NotImplementedException
+
+    @property
+    def supports_streaming(self) -> bool:
+        return all(
+            getattr(type(self), name) is not getattr(Model, name)
+            for name in ("init_state", "update", "finalize")
+        )
+
+    def snapshot_state(self, state: Any) -> bytes:
+        return pickle.dumps(state)
+
+    def restore_state(self, snapshot: bytes) -> Any:
+        return pickle.loads(snapshot)
+
+    def stream(
+        self,
+        chunks: Iterable[I],
+        state: Any = None,
+        checkpoint_every: Optional[int] = None,
+        on_checkpoint: Optional[Callable[[int, bytes], None]] = None,
+    ) -> Iterator[O]:
+        """Feeds `chunks` through the model one by one, yielding the output so far
+        after each chunk.
+
+        Pass a state restored with `restore_state` to resume an evaluation. Every
+        `checkpoint_every` chunks, `on_checkpoint` receives the number of chunks
+        consumed in this run and a snapshot of the state.
+        """
+        if not self.supports_streaming:
+            raise NotImplementedException(
+                f"`{type(self).__name__}` does not implement the streaming contract"
+            )
+
+        # Like `__call__`, hold the model lock for every call but never across a yield
+        lock = self._call_lock or contextlib.nullcontext()
+
+        if state is None:
+            with lock:
+                state = self.init_state()
+
+        for i, chunk in enumerate(chunks, start=1):
+            with lock:
+                state = self.update(state, chunk)
+
+            if checkpoint_every and on_checkpoint and i % checkpoint_every == 0:
+                on_checkpoint(i, self.snapshot_state(state))
+
+            with lock:
+                output = self.finalize(state)
+
+            yield output
+
     @classmethod
     def register_model(cls) -> None:
         try:
@@ -47,27 +183,90 @@ class Model(ABC, Generic[I, O]):
         except Exception as e:
             raise RuntimeError(f"`{cls.__name__}` model not defined properly. {e}")
 
-        def create_model(**kwargs) -> Model:
-            return cls()
-
-        register(cls._id, create_model)
+        # A partial of a module-level function keeps loaded models picklable
+        register(cls._id, functools.partial(_create_model, cls))
 
     def __call__(self, *args: Any, **kwargs: Any) -> O:
-        return self.get_output(*args, **kwargs)
-
-    def validate(self, verbose: bool = False, return_on_failure: bool = False) -> bool:
+        lock = self._call_lock
+        if lock is None:
+            return self.get_output(*args, **kwargs)
+
+        with lock:
+            return self.get_output(*args, **kwargs)
+
+    def warmup(
+        self,
+        iterations: int = 3,
+        max_iterations: int = 20,
+        batch_size: int = 1,
+        window: int = 3,
+        tolerance: float = 0.1,
+    ) -> WarmupReport:
+        """Runs `dummy_input` through the model until the latency stabilizes.
+
+        Every iteration calls the model `batch_size` times and records the mean
+        latency of one call. The model is considered stable once the last `window`
+        latencies lie within `tolerance` (relative to their median) of each other,
+        and at least `iterations` calls were made.
+        """
+        if iterations < 1 or max_iterations < iterations:
+            raise ValueError(
+                "`iterations` must be positive and not exceed `max_iterations`"
+            )
+        if batch_size < 1 or window < 1:
+            raise ValueError("`batch_size` and `window` must be positive")
+
+        report = WarmupReport(window=window)
+        dummy_input = self.dummy_input
+
+        while report.iterations < max_iterations:
+            start = time.perf_counter()
+            for _ in range(batch_size):
+                self(dummy_input)
+            report.latencies.append((time.perf_counter() - start) / batch_size)
+
+            if report.iterations < max(iterations, window):
+                continue
+
+            recent = report.latencies[-window:]
+            median = statistics.median(recent)
+            if max(recent) - min(recent) <= tolerance * median:
+                report.stabilized = True
+                break
+
+        self.warmup_report = report
+        return report
+
+    def validate(
+        self,
+        verbose: bool = False,
+        return_on_failure: bool = False,
+        timeout: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+    ) -> bool:
         if (
             not _check_implemented(self, "get_output", verbose=verbose)
             and return_on_failure
         ):
             return False
 
-        if not _check_model_output(self, verbose=verbose):
+        if not _check_model_output(
+            self, verbose=verbose, timeout=timeout, memory_limit=memory_limit
+        ):
+            return False
+
+        if self.supports_streaming and not _check_streaming_output(
+            self, verbose=verbose, timeout=timeout, memory_limit=memory_limit
+        ):
             return False
 
         return True
 
 
+def _create_model(cls: type[Model], **kwargs: Any) -> Model:
+    return cls()
+
+
 def _check_implemented(model: Model, fn_name: str, verbose: bool = False) -> bool:
     try:
         getattr(model, fn_name)()
@@ -84,9 +283,17 @@ def _check_implemented(model: Model, fn_name: str, verbose: bool = False) -> boo
     return True
 
 
-def _check_model_output(model: Model, verbose: bool = True) -> bool:
+def _check_model_output(
+    model: Model,
+    verbose: bool = True,
+    timeout: Optional[float] = None,
+    memory_limit: Optional[int] = None,
+) -> bool:
     try:
-        _ = model(model.dummy_input)
+        with span("inference check", id=getattr(type(model), "_id", None)):
+            _ = call_with_limits(
+                model, model.dummy_input, timeout=timeout, memory_limit=memory_limit
+            )
 
         if verbose:
             print(f"  \033[32m\033[1m✔\033[0m\033[0m model generates output correctly")
@@ -99,6 +306,33 @@ def _check_model_output(model: Model, verbose: bool = True) -> bool:
         return False
 
 
+def _check_streaming_output(
+    model: Model,
+    verbose: bool = True,
+    timeout: Optional[float] = None,
+    memory_limit: Optional[int] = None,
+) -> bool:
+    try:
+        _ = call_with_limits(
+            _stream_dummy_input, model, timeout=timeout, memory_limit=memory_limit
+        )
+
+        if verbose:
+            print(f"  \033[32m\033[1m✔\033[0m\033[0m model streams output correctly")
+
+        return True
+    except Exception as e:
+        if verbose:
+            print(f"  \033[91m\033[1m✘\033[0m\033[0m model streaming error ({e})")
+
+        return False
+
+
+def _stream_dummy_input(model: Model) -> Any:
+    state = model.restore_state(model.snapshot_state(model.init_state()))
+    return model.finalize(model.update(state, model.dummy_input))
+
+
 if __name__ == "__main__":
 
     class TestModel(Model[float, float]):
@@ -1,7 +1,9 @@
 import abc
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Generic, TypeVar
+from typing import Any, Callable, Generic, Iterable, Iterator, Optional, TypeVar
+
+from .concurrency import ConcurrencyMode
 
 class NotImplementedException(BaseException): ...
 
@@ -10,10 +12,30 @@ class ModelMetadata:
     id: str
     def __init__(self, id) -> None: ...
 
+@dataclass
+class WarmupReport:
+    latencies: list[float] = ...
+    stabilized: bool = ...
+    window: int = ...
+    def __init__(self, latencies, stabilized, window) -> None: ...
+    @property
+    def iterations(self) -> int: ...
+    @property
+    def first_latency(self) -> Optional[float]: ...
+    @property
+    def stable_latency(self) -> Optional[float]: ...
+    @property
+    def total_time(self) -> float: ...
+
 I = TypeVar("I")
 O = TypeVar("O")
 
 class Model(ABC, Generic[I, O], metaclass=abc.ABCMeta):
+    warmup_report: Optional[WarmupReport]
+    @property
+    def concurrency(self) -> ConcurrencyMode: ...
+    @property
+    def is_ready(self) -> bool: ...
     @property
     @abstractmethod
     def dummy_input(self) -> I: ...
@@ -22,7 +44,35 @@ class Model(ABC, Generic[I, O], metaclass=abc.ABCMeta):
     def dummy_output(self) -> O: ...
     @abstractmethod
     def get_output(self, *args: Any, **kwargs: Any) -> O: ...
+    def init_state(self) -> Any: ...
+    def update(self, state: Any, chunk: I) -> Any: ...
+    def finalize(self, state: Any) -> O: ...
+    @property
+    def supports_streaming(self) -> bool: ...
+    def snapshot_state(self, state: Any) -> bytes: ...
+    def restore_state(self, snapshot: bytes) -> Any: ...
+    def stream(
+        self,
+        chunks: Iterable[I],
+        state: Any = None,
+        checkpoint_every: Optional[int] = None,
+        on_checkpoint: Optional[Callable[[int, bytes], None]] = None,
+    ) -> Iterator[O]: ...
     @classmethod
     def register_model(cls) -> None: ...
     def __call__(self, *args: Any, **kwargs: Any) -> O: ...
-    def validate(self, verbose: bool, return_on_failure: bool) -> bool: ...
+    def warmup(
+        self,
+        iterations: int = 3,
+        max_iterations: int = 20,
+        batch_size: int = 1,
+        window: int = 3,
+        tolerance: float = 0.1,
+    ) -> WarmupReport: ...
+    def validate(
+        self,
+        verbose: bool = False,
+        return_on_failure: bool = False,
+        timeout: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+    ) -> bool: ...
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import sys
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None  # type: ignore
+
+
+class ModelTimeoutError(TimeoutError):
+    pass
+
+
+class ModelMemoryError(MemoryError):
+    pass
+
+
+def set_memory_limit(memory_limit: Optional[int]) -> None:
+    """Caps the address space of the current process at `memory_limit` bytes."""
+    if memory_limit is None:
+        return
+
+    if resource is None or not sys.platform.startswith("linux"):
+        logging.warning(
+            f"Memory limits are only enforced on Linux, ignoring {memory_limit} bytes."
+        )
+        return
+
+    resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+
+def _worker(
+    conn: Connection,
+    fn: Callable,
+    args: tuple,
+    kwargs: dict,
+    memory_limit: Optional[int],
+) -> None:
+    try:
+        set_memory_limit(memory_limit)
+        conn.send(("ok", fn(*args, **kwargs)))
+    except MemoryError:
+        conn.send(("memory", None))
+    except BaseException as e:
+        conn.send(("error", e))
+    finally:
+        conn.close()
+
+
+def call_with_limits(
+    fn: Callable,
+    *args: Any,
+    timeout: Optional[float] = None,
+    memory_limit: Optional[int] = None,
+    **kwargs: Any,
+) -> Any:
+    """Runs `fn(*args, **kwargs)` in a worker process.
+
+    The worker is killed once it runs for longer than `timeout` seconds, and its
+    address space is capped at `memory_limit` bytes (Linux only). Without limits `fn`
+    is called directly. Workers are forked where possible, otherwise `fn`, its
+    arguments and its result have to be picklable.
+    """
+    if timeout is None and memory_limit is None:
+        return fn(*args, **kwargs)
+
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork" if "fork" in methods else None)
+
+    receiver, sender = ctx.Pipe(duplex=False)
+    process = ctx.Process(
+        target=_worker, args=(sender, fn, args, kwargs, memory_limit), daemon=True
+    )
+    process.start()
+    sender.close()
+
+    try:
+        if not receiver.poll(timeout):
+            raise ModelTimeoutError(f"Model did not finish within {timeout}s")
+
+        try:
+            status, value = receiver.recv()
+        except EOFError:
+            process.join()
+            raise RuntimeError(
+                f"Model worker exited unexpectedly (exit code {process.exitcode})"
+            )
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        receiver.close()
+
+    if status == "memory":
+        raise ModelMemoryError(
+            f"Model exceeded the memory limit of {memory_limit} bytes"
+        )
+    elif status == "error":
+        raise value
+
+    return value
@@ -0,0 +1,13 @@
+from typing import Any, Callable, Optional
+
+class ModelTimeoutError(TimeoutError): ...
+class ModelMemoryError(MemoryError): ...
+
+def set_memory_limit(memory_limit: Optional[int]) -> None: ...
+def call_with_limits(
+    fn: Callable,
+    *args: Any,
+    timeout: Optional[float] = None,
+    memory_limit: Optional[int] = None,
+    **kwargs: Any,
+) -> Any: ...
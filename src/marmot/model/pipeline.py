@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence, Union
+
+from ..tracing import span
+from .concurrency import ConcurrencyMode
+from .core import Model
+from .registration import load_shared
+
+
+@dataclass
+class Node:
+    model_id: str
+
+    # names of the upstream nodes whose outputs are passed to the model, in order.
+    # Nodes without inputs receive the input of the pipeline.
+    inputs: Sequence[str] = ()
+
+    # model initialisation arguments
+    kwargs: dict = field(default_factory=dict)
+
+
+class Pipeline(Model[Any, Any]):
+    """Chains registered models into a directed acyclic graph.
+
+    Subclasses declare the graph in `_nodes` (node name to `Node`) and the node(s)
+    whose output is returned in `_outputs`. A call only evaluates the nodes the
+    requested outputs depend on, each of them once, and runs nodes whose inputs are
+    ready concurrently on up to `_max_workers` threads. `close` (or garbage
+    collection) shuts the threads down.
+    """
+
+    _nodes: dict[str, Node]
+    _outputs: Union[str, Sequence[str]]
+    _max_workers: Optional[int] = None
+
+    # Intermediates live in a per-call cache and the node models are shared
+    # according to their own concurrency mode
+    _concurrency = ConcurrencyMode.REENTRANT
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self._order = _topological_order(self._nodes)
+        self.models = {
+            name: load_shared(node.model_id, **node.kwargs)
+            for name, node in self._nodes.items()
+        }
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        # Worker threads do not survive a fork (e.g. `call_with_limits`), so every
+        # process gets a pool of its own
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix=self._id
+            )
+            self._executor_pid = os.getpid()
+
+        return self._executor
+
+    def close(self) -> None:
+        """Shuts down the worker threads; a later call starts new ones."""
+        executor, self._executor = getattr(self, "_executor", None), None
+        if executor is not None and self._executor_pid == os.getpid():
+            executor.shutdown(wait=False)
+
+    def __del__(self) -> None:
+        self.close()
+
+    @property
+    def output_names(self) -> tuple[str, ...]:
+        return _as_names(self._outputs)
+
+    @property
+    def dummy_input(self) -> Any:
+        source = next(name for name in self._order if not self._nodes[name].inputs)
+        return self.models[source].dummy_input
+
+    @property
+    def dummy_output(self) -> Any:
+        return self._collect(
+            {name: self.models[name].dummy_output for name in self.output_names}
+        )
+
+    def get_output(
+        self, *args: Any, outputs: Optional[Union[str, Sequence[str]]] = None
+    ) -> Any:
+        return self._collect(self.evaluate(*args, outputs=outputs), outputs)
+
+    def evaluate(
+        self, *args: Any, outputs: Optional[Union[str, Sequence[str]]] = None
+    ) -> dict[str, Any]:
+        """Returns the outputs of every node needed for `outputs`, keyed by name."""
+        pending = _ancestors(self._nodes, _as_names(outputs or self._outputs))
+        results: dict[str, Any] = {}
+
+        while pending:
+            ready = [
+                name
+                for name in self._order
+                if name in pending
+                and all(upstream in results for upstream in self._nodes[name].inputs)
+            ]
+
+            if len(ready) == 1:
+                results[ready[0]] = self._run_node(ready[0], args, results)
+            else:
+                futures = {
+                    name: self.executor.submit(self._run_node, name, args, results)
+                    for name in ready
+                }
+                results.update({name: f.result() for name, f in futures.items()})
+
+            pending.difference_update(ready)
+
+        return results
+
+    def _run_node(self, name: str, args: tuple, results: dict[str, Any]) -> Any:
+        node = self._nodes[name]
+        node_args = tuple(results[upstream] for upstream in node.inputs) or args
+
+        with span("pipeline node", node=name, id=node.model_id):
+            return self.models[name](*node_args)
+
+    def _collect(
+        self,
+        results: dict[str, Any],
+        outputs: Optional[Union[str, Sequence[str]]] = None,
+    ) -> Any:
+        # A single output name returns the output itself, a sequence a dict
+        outputs = outputs or self._outputs
+        if isinstance(outputs, str):
+            return results[outputs]
+
+        return {name: results[name] for name in outputs}
+
+
+def _as_names(outputs: Union[str, Sequence[str]]) -> tuple[str, ...]:
+    if isinstance(outputs, str):
+        return (outputs,)
+
+    return tuple(outputs)
+
+
+def _topological_order(nodes: dict[str, Node]) -> list[str]:
+    order: list[str] = []
+    visiting: set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in order:
+            return
+        if name in visiting:
+            raise ValueError(f"Pipeline contains a cycle through node `{name}`")
+        if name not in nodes:
+            raise ValueError(f"Pipeline node `{name}` is not defined")
+
+        visiting.add(name)
+        for upstream in nodes[name].inputs:
+            visit(upstream)
+        visiting.remove(name)
+
+        order.append(name)
+
+    for name in nodes:
+        visit(name)
+
+    return order
+
+
+def _ancestors(nodes: dict[str, Node], outputs: Sequence[str]) -> set[str]:
+    required: set[str] = set()
+    stack = list(outputs)
+
+    while stack:
+        name = stack.pop()
+        if name in required:
+            continue
+        if name not in nodes:
+            raise ValueError(f"Pipeline node `{name}` is not defined")
+
+        required.add(name)
+        stack.extend(nodes[name].inputs)
+
+    return required
@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Sequence, Union
+
+from .concurrency import ThreadLocalModel
+from .core import Model
+
+@dataclass
+class Node:
+    model_id: str
+    inputs: Sequence[str] = ...
+    kwargs: dict = ...
+    def __init__(self, model_id, inputs, kwargs) -> None: ...
+
+class Pipeline(Model[Any, Any]):
+    models: dict[str, Union[Model, ThreadLocalModel]]
+    def __init__(self) -> None: ...
+    @property
+    def executor(self) -> ThreadPoolExecutor: ...
+    def close(self) -> None: ...
+    def __del__(self) -> None: ...
+    @property
+    def output_names(self) -> tuple[str, ...]: ...
+    @property
+    def dummy_input(self) -> Any: ...
+    @property
+    def dummy_output(self) -> Any: ...
+    def get_output(
+        self, *args: Any, outputs: Optional[Union[str, Sequence[str]]] = None
+    ) -> Any: ...
+    def evaluate(
+        self, *args: Any, outputs: Optional[Union[str, Sequence[str]]] = None
+    ) -> dict[str, Any]: ...
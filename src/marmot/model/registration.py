@@ -1,22 +1,31 @@
 from __future__ import annotations
 
-import sys
-
-sys.path.insert(0, ".marmot_models")
-
 import copy
 import difflib
+import functools
+import hashlib
 import importlib
+import json
 import logging
+import os
 import re
+import sys
+import tempfile
+import threading
 from dataclasses import dataclass, field
 from importlib.util import find_spec
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Optional, Protocol, Union
 
+from ..tracing import get_tracer, span
+from .concurrency import ConcurrencyMode, ThreadLocalModel
+
 if TYPE_CHECKING:
     from .core import Model
 
+_MODEL_ARCHIVE_DIR = ".marmot-models"
+_MODEL_STORE_URL = "http://172.20.116.94:8234/models"
+
 MODEL_ID_RE = re.compile(
     r"^(?:(?P<namespace>[\w:-]+)\/)?(?:(?P<name>[\w:.-]+?))(?:-v(?P<version>\d+))?$"
 )
@@ -47,7 +56,33 @@ class ModelSpec:
 _registry: dict[str, ModelSpec] = {}
 current_namespace: Optional[str] = None
 
-
+# Caches of `load`, invalidated whenever the registry changes.
+# `_resolved_specs` maps the requested id (incl. module prefix) to its registered spec.
+_resolved_specs: dict[str, ModelSpec] = {}
+
+# Instances handed out by `load_shared`, keyed by spec id and model kwargs
+# Models are constructed under a lock of their own key only, so that constructing one
+# shared model may load others (e.g. the nodes of a pipeline)
+_shared_models: dict[tuple, Union[Model, ThreadLocalModel]] = {}
+_shared_model_locks: dict[tuple, threading.RLock] = {}
+_shared_models_lock = threading.Lock()
+
+
+def _invalidate_caches(model_id: Optional[str] = None) -> None:
+    # Shared instances are only dropped for the (re-)registered model, or for all
+    # models if no id is given
+    _resolved_specs.clear()
+    load_model_creator.cache_clear()
+    with _shared_models_lock:
+        for key in list(_shared_models):
+            if model_id is None or key[0] == model_id:
+                del _shared_models[key]
+        for key in list(_shared_model_locks):
+            if model_id is None or key[0] == model_id:
+                del _shared_model_locks[key]
+
+
+@functools.lru_cache(maxsize=None)
 def parse_model_id(model_id: str) -> tuple[Optional[str], str, Optional[int]]:
     match = MODEL_ID_RE.fullmatch(model_id)
     if not match:
@@ -211,12 +246,114 @@ def _check_spec_register(testing_spec: ModelSpec):
         )
 
 
+def _download_model_archive(module: str, directory: Path) -> Path:
+    """Returns the newest archive of `module`, downloading it into `directory` if the
+    model store has a version of it that is not there yet.
+
+    Every version is stored under a name of its own (the hash of its content) and
+    never modified afterwards, so processes that imported an older version keep
+    reading a consistent archive. `current.json` records the ETag and file of the
+    newest version.
+    """
+    import urllib.error
+    import urllib.request
+
+    current_file = directory / "current.json"
+    current = json.loads(current_file.read_text()) if current_file.exists() else None
+    cached = directory / current["archive"] if current is not None else None
+    if cached is not None and not cached.exists():
+        current = cached = None
+
+    request = urllib.request.Request(f"{_MODEL_STORE_URL}/{module}")
+    if current is not None and current["etag"] is not None:
+        request.add_header("If-None-Match", current["etag"])
+
+    try:
+        response = urllib.request.urlopen(request)
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and cached is not None:
+            return cached
+        raise
+    except urllib.error.URLError as e:
+        if cached is None:
+            raise
+
+        logging.warn(
+            f"Could not refresh the model archive {cached} ({e.reason}), "
+            "using the cached copy."
+        )
+        return cached
+
+    # Download next to the archives and move it into place, so that an interrupted
+    # download never leaves a truncated archive behind
+    directory.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    with response, tempfile.NamedTemporaryFile(
+        dir=directory, suffix=".part", delete=False
+    ) as tmp:
+        try:
+            while chunk := response.read(1 << 20):
+                digest.update(chunk)
+                tmp.write(chunk)
+
+            expected_size = response.headers.get("Content-Length")
+            if expected_size is not None and tmp.tell() != int(expected_size):
+                raise OSError(
+                    f"Incomplete download of model archive `{module}`: "
+                    f"{tmp.tell()} of {expected_size} bytes"
+                )
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+
+    filename = directory / f"{digest.hexdigest()[:16]}.zip"
+    if filename.exists():
+        os.unlink(tmp.name)
+    else:
+        os.replace(tmp.name, filename)
+
+    _write_atomically(
+        current_file,
+        json.dumps({"etag": response.headers.get("ETag"), "archive": filename.name}),
+    )
+
+    return filename
+
+
+def _write_atomically(filename: Path, text: str) -> None:
+    with tempfile.NamedTemporaryFile(
+        "w", dir=filename.parent, suffix=".part", delete=False
+    ) as tmp:
+        tmp.write(text)
+
+    os.replace(tmp.name, filename)
+
+
+def _add_model_archive(module: str) -> None:
+    # Model packages are imported straight from their archive, without extraction
+    directory = Path(_MODEL_ARCHIVE_DIR).absolute() / module
+
+    with span("download", module=module):
+        filename = str(_download_model_archive(module, directory))
+
+    if filename not in sys.path:
+        # Older versions of the archive are no longer used for new imports
+        sys.path[:] = [path for path in sys.path if Path(path).parent != directory]
+        sys.path.insert(0, filename)
+        importlib.invalidate_caches()
+
+
 def _find_spec(model_id: str) -> ModelSpec:
     global _registry
 
     # For string id's, load the model spec from the registry then make the model spec
     assert isinstance(model_id, str)
 
+    model_spec = _resolved_specs.get(model_id)
+    if model_spec is not None:
+        return model_spec
+
     # The model name can include an unloaded module in "module:model_name" style
     if ":" in model_id:
         module, model_name = model_id.split(":")
@@ -229,21 +366,11 @@ def _find_spec(model_id: str) -> ModelSpec:
             module = module.replace("#", "__")
 
         if not find_spec(module):
-            import urllib.request
-            import zipfile
-
-            filename = Path(".marmot-models") / ".compressed" / f"{module}.zip"
-            filename.parent.mkdir(parents=True, exist_ok=True)
-
-            urllib.request.urlretrieve(
-                f"http://172.20.116.94:8234/models/{module}", filename
-            )
-
-            with zipfile.ZipFile(filename, "r") as zip_ref:
-                zip_ref.extractall(".marmot-models")
+            _add_model_archive(module)
 
         try:
-            importlib.import_module(module)
+            with span("import module", module=module):
+                importlib.import_module(module)
         except ModuleNotFoundError as e:
             raise ModuleNotFoundError(
                 f"{e}. Model registration via importing a module failed. "
@@ -274,9 +401,11 @@ def _find_spec(model_id: str) -> ModelSpec:
             "to see all of the registered models."
         )
 
+    _resolved_specs[model_id] = model_spec
     return model_spec
 
 
+@functools.lru_cache(maxsize=None)
 def load_model_creator(name: str) -> ModelCreator:
     mod_name, attr_name = name.split(":")
     mod = importlib.import_module(mod_name)
@@ -318,14 +447,41 @@ def register(
         logging.warn(f"Overriding model {new_spec.id} already in registry")
 
     _registry[new_spec.id] = new_spec
+    _invalidate_caches(new_spec.id)
+
+
+def _copy_spec(model_spec: ModelSpec) -> ModelSpec:
+    # Every model gets a spec of its own. Copying the fields directly is several
+    # times cheaper than `copy.copy` and skips `__post_init__`
+    spec = object.__new__(ModelSpec)
+    spec.__dict__.update(model_spec.__dict__)
+    return spec
 
 
 def load(
     id: Union[str, ModelSpec],
+    warmup_options: Union[bool, dict] = False,
     **kwargs: Any,
+) -> Model:
+    # Even disabled spans cost time, so they are only entered when tracing
+    if not get_tracer().enabled:
+        return _load(id, warmup_options, kwargs, False)
+
+    with span("load", id=getattr(id, "id", id)):
+        return _load(id, warmup_options, kwargs, True)
+
+
+def _load(
+    id: Union[str, ModelSpec],
+    warmup_options: Union[bool, dict],
+    kwargs: dict,
+    traced: bool,
 ) -> Model:
     if isinstance(id, ModelSpec):
         model_spec = id
+    elif traced:
+        with span("find spec", id=id):
+            model_spec = _find_spec(id)
     else:
         assert isinstance(id, str)
         model_spec = _find_spec(id)
@@ -333,7 +489,7 @@ def load(
     assert isinstance(model_spec, ModelSpec)
 
     # Update the model spec kwargs with the `make` kwargs
-    model_spec_kwargs = copy.deepcopy(model_spec.kwargs)
+    model_spec_kwargs = copy.deepcopy(model_spec.kwargs) if model_spec.kwargs else {}
     model_spec_kwargs.update(kwargs)
 
     # Load the model creator
@@ -345,7 +501,11 @@ def load(
         model_creator = load_model_creator(model_spec.entry_point)
 
     try:
-        model = model_creator(**model_spec_kwargs)
+        if traced:
+            with span("construct model", id=model_spec.id):
+                model = model_creator(**model_spec_kwargs)
+        else:
+            model = model_creator(**model_spec_kwargs)
     except TypeError as e:
         raise type(e)(
             f"{e} was raised from the model creator for {model_spec.id} with kwargs ({model_spec_kwargs})"
@@ -358,9 +518,57 @@ def load(
             f"The model must inherit from the marmot.Model class, actual class: {type(model)}."
         )
 
-    model.spec = ModelSpec(
-        id=model_spec.id, entry_point=model_spec.entry_point, kwargs=model_spec.kwargs
-    )
+    model.spec = _copy_spec(model_spec)
 
     assert model.spec is not None
+
+    # Pay lazy-initialisation costs before the first real request. Warm-up settings
+    # are not called `warmup` so as not to shadow a model kwarg of that name
+    if warmup_options:
+        with span("warmup", id=model_spec.id):
+            options = warmup_options if isinstance(warmup_options, dict) else {}
+            model.warmup(**options)
+
+    return model
+
+
+def load_shared(
+    id: Union[str, ModelSpec],
+    **kwargs: Any,
+) -> Union[Model, ThreadLocalModel]:
+    if isinstance(id, ModelSpec):
+        model_spec = id
+    else:
+        assert isinstance(id, str)
+        model_spec = _find_spec(id)
+
+    key = (model_spec.id, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError as e:
+        raise TypeError(
+            f"Shared instances of {model_spec.id} require hashable kwargs ({kwargs})"
+        ) from e
+
+    with _shared_models_lock:
+        model = _shared_models.get(key)
+        if model is not None:
+            return model
+
+        key_lock = _shared_model_locks.setdefault(key, threading.RLock())
+
+    with key_lock:
+        model = _shared_models.get(key)
+        if model is not None:
+            return model
+
+        # Reentrant and lock-guarded models are shared as they are, all other
+        # models get an instance per calling thread
+        model = load(model_spec, **kwargs)
+        if model.concurrency is ConcurrencyMode.PER_THREAD:
+            model = ThreadLocalModel(lambda: load(model_spec, **kwargs), model)
+
+        with _shared_models_lock:
+            model = _shared_models.setdefault(key, model)
+
     return model
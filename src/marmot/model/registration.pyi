@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from re import Pattern
 from typing import Any, Optional, Protocol, Union
 
+from .concurrency import ThreadLocalModel
 from .core import Model
 
 MODEL_ID_RE: Pattern
@@ -32,4 +33,11 @@ def register(
     id: str, entry_point: Optional[Union[str, ModelCreator]], kwargs: dict = {}
 ) -> None: ...
 def get_categories() -> dict[str, list[int]]: ...
-def load(id: Union[str, ModelSpec], **kwargs: Any) -> Model: ...
+def load(
+    id: Union[str, ModelSpec],
+    warmup_options: Union[bool, dict] = False,
+    **kwargs: Any,
+) -> Model: ...
+def load_shared(
+    id: Union[str, ModelSpec], **kwargs: Any
+) -> Union[Model, ThreadLocalModel]: ...
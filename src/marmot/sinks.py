@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import os
+import queue
+import threading
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Union
+
+if TYPE_CHECKING:
+    from .model.core import Model
+
+
+@dataclass
+class Chunk:
+    # index of the first prediction of the chunk within the run
+    start: int
+
+    # predictions by column name, all columns have the same length
+    columns: dict[str, list]
+
+    @property
+    def rows(self) -> int:
+        return len(next(iter(self.columns.values()), []))
+
+
+class PredictionSink:
+    """Buffers model predictions into columnar chunks written by a background thread.
+
+    Predictions are split into columns: scalars go to `prediction`, dicts to one
+    column per key and tuples or lists to one column per position. At most
+    `max_pending_chunks` full chunks wait for the writer, after which `write` blocks,
+    which bounds the memory used. Every chunk is written together with the id and
+    version of `model.spec` (or `model_id`/`model_version` when given explicitly).
+    Subclasses implement `_open`, `_write_chunk` and `_close`.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        model: Optional[Model] = None,
+        model_id: Optional[str] = None,
+        model_version: Optional[int] = None,
+        chunk_size: int = 10000,
+        max_pending_chunks: int = 4,
+    ) -> None:
+        spec = getattr(model, "spec", None)
+        self.path = Path(path)
+        self.model_id = model_id or getattr(spec, "id", None)
+        self.model_version = model_version or getattr(spec, "version", None)
+        self.chunk_size = chunk_size
+
+        self._columns: Optional[dict[str, list]] = None
+        self._start = 0
+        self._count = 0
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+        self._queue: queue.Queue[Optional[Chunk]] = queue.Queue(max_pending_chunks)
+        self._writer = threading.Thread(target=self._run, daemon=True)
+        self._writer.start()
+
+    def __enter__(self) -> PredictionSink:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def write(self, prediction: Any) -> None:
+        self._raise_writer_error()
+        if self._closed:
+            raise RuntimeError(f"The sink writing to {self.path} is closed")
+
+        row = _flatten(prediction)
+        if self._columns is None:
+            self._columns = {name: [] for name in row}
+        elif row.keys() != self._columns.keys():
+            raise ValueError(
+                f"Prediction columns {list(row)} do not match {list(self._columns)}"
+            )
+
+        for name, value in row.items():
+            self._columns[name].append(value)
+
+        self._count += 1
+        if self._count - self._start >= self.chunk_size:
+            self.flush()
+
+    def write_many(self, predictions: Iterable[Any]) -> int:
+        """Writes every prediction of e.g. `map(model, inputs)` or `model.stream()`
+        and returns how many were written."""
+        count = self._count
+        for prediction in predictions:
+            self.write(prediction)
+
+        return self._count - count
+
+    def flush(self) -> None:
+        if self._columns is None or self._count == self._start:
+            return
+
+        chunk = Chunk(self._start, self._columns)
+        self._columns = {name: [] for name in self._columns}
+        self._start = self._count
+
+        self._put(chunk)
+
+    def close(self) -> None:
+        if self._closed:
+            self._raise_writer_error()
+            return
+
+        self._closed = True
+        self.flush()
+        self._put(None)
+        self._writer.join()
+        self._raise_writer_error()
+
+    def _put(self, chunk: Optional[Chunk]) -> None:
+        # Avoid blocking forever on a writer that has died
+        while self._writer.is_alive():
+            try:
+                self._queue.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+        self._raise_writer_error()
+        raise RuntimeError(f"The sink writing to {self.path} is closed")
+
+    def _raise_writer_error(self) -> None:
+        # The error is kept, every later write or close fails the same way
+        if self._error is not None:
+            raise RuntimeError(
+                f"Writing predictions to {self.path} failed"
+            ) from self._error
+
+    def _run(self) -> None:
+        try:
+            self._open()
+            try:
+                while (chunk := self._queue.get()) is not None:
+                    self._write_chunk(chunk)
+            finally:
+                self._close()
+        except BaseException as e:
+            self._error = e
+
+    def _open(self) -> None:
+        raise NotImplementedError
+
+    def _write_chunk(self, chunk: Chunk) -> None:
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        raise NotImplementedError
+
+
+class CsvSink(PredictionSink):
+    """Writes predictions as CSV, gzip-compressed if the path ends with `.gz`."""
+
+    def _open(self) -> None:
+        if self.path.suffix == ".gz":
+            self._file: io.TextIOBase = gzip.open(self.path, "wt", newline="")
+        else:
+            self._file = open(self.path, "w", newline="")
+
+        self._csv = csv.writer(self._file)
+        self._header_written = False
+
+    def _write_chunk(self, chunk: Chunk) -> None:
+        if not self._header_written:
+            self._csv.writerow(["model_id", "model_version", "index", *chunk.columns])
+            self._header_written = True
+
+        self._csv.writerows(
+            (self.model_id, self.model_version, chunk.start + i, *values)
+            for i, values in enumerate(zip(*chunk.columns.values()))
+        )
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class NpySink(PredictionSink):
+    """Writes every chunk column as a `.npy` member of a compressed `.npz` archive.
+
+    Members are named `<chunk>/<column>.npy`; `metadata.json` lists the model id and
+    version and the start index and size of every chunk. Requires numpy.
+    """
+
+    def _open(self) -> None:
+        import numpy as np
+
+        self._np = np
+        self._archive = zipfile.ZipFile(
+            self.path, "w", compression=zipfile.ZIP_DEFLATED
+        )
+        self._chunks: list[dict] = []
+
+    def _write_chunk(self, chunk: Chunk) -> None:
+        name = f"{len(self._chunks):06d}"
+        for column, values in chunk.columns.items():
+            with self._archive.open(f"{name}/{column}.npy", "w") as f:
+                self._np.lib.format.write_array(f, self._np.asarray(values))
+
+        self._chunks.append({"name": name, "start": chunk.start, "rows": chunk.rows})
+
+    def _close(self) -> None:
+        metadata = {
+            "model_id": self.model_id,
+            "model_version": self.model_version,
+            "chunks": self._chunks,
+        }
+        self._archive.writestr("metadata.json", json.dumps(metadata))
+        self._archive.close()
+
+
+class ArrowSink(PredictionSink):
+    """Writes every chunk as a record batch of an Arrow IPC file (zstd-compressed).
+
+    The model id and version are stored as columns and in the schema metadata. Pass
+    `schema` to fix the types of the prediction columns. Otherwise the types are
+    inferred from the first chunk and only widened (e.g. int64 to double, null to
+    any type) when a later chunk does not fit, in which case the batches written so
+    far are rewritten with the wider schema. The file is written under a temporary
+    name and moved to `path` on close. Requires pyarrow.
+    """
+
+    def __init__(
+        self, path: Union[str, Path], *args: Any, schema: Any = None, **kwargs: Any
+    ) -> None:
+        self.schema = schema
+        super().__init__(path, *args, **kwargs)
+
+    def _open(self) -> None:
+        import pyarrow as pa
+
+        self._pa = pa
+        self._arrow_writer: Any = None
+        self._file_schema: Any = None
+        self._rewrites = 0
+
+    def _write_chunk(self, chunk: Chunk) -> None:
+        pa = self._pa
+        data = {
+            "model_id": [self.model_id] * chunk.rows,
+            "model_version": [self.model_version] * chunk.rows,
+            "index": list(range(chunk.start, chunk.start + chunk.rows)),
+            **chunk.columns,
+        }
+
+        if self.schema is not None:
+            batch = pa.record_batch(
+                data, schema=self._with_metadata(self._given_schema())
+            )
+        else:
+            batch = pa.record_batch(data)
+
+        if self._arrow_writer is None:
+            self._file_schema = self._with_metadata(batch.schema)
+            self._arrow_writer = self._new_writer(self._file_schema)
+        elif not batch.schema.equals(self._file_schema, check_metadata=False):
+            schema = self._with_metadata(
+                pa.unify_schemas(
+                    [self._file_schema, batch.schema], promote_options="permissive"
+                )
+            )
+            if not schema.equals(self._file_schema, check_metadata=False):
+                self._rewrite(schema)
+
+        self._arrow_writer.write_table(
+            pa.Table.from_batches([batch]).cast(self._file_schema)
+        )
+
+    def _given_schema(self) -> Any:
+        pa = self._pa
+        return pa.schema(
+            [
+                pa.field("model_id", pa.string()),
+                pa.field("model_version", pa.int64()),
+                pa.field("index", pa.int64()),
+                *self.schema,
+            ]
+        )
+
+    def _with_metadata(self, schema: Any) -> Any:
+        return schema.with_metadata(
+            {"model_id": str(self.model_id), "model_version": str(self.model_version)}
+        )
+
+    @property
+    def _tmp_path(self) -> Path:
+        return self.path.with_name(f"{self.path.name}.{self._rewrites}.part")
+
+    def _new_writer(self, schema: Any) -> Any:
+        pa = self._pa
+        return pa.ipc.new_file(
+            str(self._tmp_path),
+            schema,
+            options=pa.ipc.IpcWriteOptions(compression="zstd"),
+        )
+
+    def _rewrite(self, schema: Any) -> None:
+        # A file has a single schema, so the batches written so far are converted
+        pa = self._pa
+        self._arrow_writer.close()
+        old_path = self._tmp_path
+
+        self._rewrites += 1
+        self._file_schema = schema
+        self._arrow_writer = self._new_writer(schema)
+        with pa.memory_map(str(old_path)) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                table = pa.Table.from_batches([reader.get_batch(i)])
+                self._arrow_writer.write_table(table.cast(schema))
+
+        old_path.unlink()
+
+    def _close(self) -> None:
+        if self._arrow_writer is not None:
+            self._arrow_writer.close()
+            os.replace(self._tmp_path, self.path)
+
+
+def _flatten(prediction: Any) -> dict[str, Any]:
+    if isinstance(prediction, dict):
+        return {str(key): value for key, value in prediction.items()}
+    elif isinstance(prediction, (tuple, list)):
+        return {f"prediction_{i}": value for i, value in enumerate(prediction)}
+
+    return {"prediction": prediction}
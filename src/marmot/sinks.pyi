@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Optional, Union
+
+from .model.core import Model
+
+@dataclass
+class Chunk:
+    start: int
+    columns: dict[str, list]
+    def __init__(self, start, columns) -> None: ...
+    @property
+    def rows(self) -> int: ...
+
+class PredictionSink:
+    path: Path
+    model_id: Optional[str]
+    model_version: Optional[int]
+    chunk_size: int
+    def __init__(
+        self,
+        path: Union[str, Path],
+        model: Optional[Model] = None,
+        model_id: Optional[str] = None,
+        model_version: Optional[int] = None,
+        chunk_size: int = 10000,
+        max_pending_chunks: int = 4,
+    ) -> None: ...
+    def __enter__(self) -> PredictionSink: ...
+    def __exit__(self, *exc_info: Any) -> None: ...
+    @property
+    def count(self) -> int: ...
+    def write(self, prediction: Any) -> None: ...
+    def write_many(self, predictions: Iterable[Any]) -> int: ...
+    def flush(self) -> None: ...
+    def close(self) -> None: ...
+
+class CsvSink(PredictionSink): ...
+class NpySink(PredictionSink): ...
+
+class ArrowSink(PredictionSink):
+    schema: Any
+    def __init__(
+        self, path: Union[str, Path], *args: Any, schema: Any = None, **kwargs: Any
+    ) -> None: ...
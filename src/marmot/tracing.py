@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar, Union
+
+F = TypeVar("F", bound=Callable)
+
+
+@dataclass
+class Span:
+    name: str
+
+    # start and duration in nanoseconds of `time.perf_counter_ns`
+    start: int
+    duration: int = 0
+
+    pid: int = field(default_factory=os.getpid)
+    tid: int = field(default_factory=threading.get_ident)
+    args: dict = field(default_factory=dict)
+
+
+class Tracer:
+    """Records timed spans, exportable as Chrome trace events.
+
+    Tracing is disabled by default, in which case `span` costs next to nothing.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.spans: list[Span] = []
+        self.events: list[dict] = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+
+        span = Span(name, time.perf_counter_ns(), args=args)
+        try:
+            yield
+        finally:
+            span.duration = time.perf_counter_ns() - span.start
+            with self._lock:
+                self.spans.append(span)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+            self.events.clear()
+
+    def add_events(self, filename: Union[str, Path]) -> None:
+        """Merges the trace events exported by another process, e.g. a subprocess."""
+        with open(filename) as f:
+            events = json.load(f)["traceEvents"]
+
+        with self._lock:
+            self.events.extend(events)
+
+    def to_chrome_trace(self) -> dict:
+        events = [
+            {
+                "name": span.name,
+                "ph": "X",
+                "ts": span.start / 1000,
+                "dur": span.duration / 1000,
+                "pid": span.pid,
+                "tid": span.tid,
+                "args": span.args,
+            }
+            for span in self.spans
+        ]
+
+        return {"traceEvents": events + self.events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, filename: Union[str, Path]) -> None:
+        with open(filename, "w") as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+
+    def summary(self) -> str:
+        totals: dict[str, list[float]] = {}
+        for event in self.to_chrome_trace()["traceEvents"]:
+            totals.setdefault(event["name"], []).append(event["dur"] / 1000)
+
+        width = max((len(name) for name in totals), default=4)
+        lines = [
+            f"{'span':<{width}} {'count':>6} {'total (ms)':>11} "
+            f"{'mean (ms)':>11} {'max (ms)':>11}"
+        ]
+        for name, durations in sorted(totals.items(), key=lambda kv: -sum(kv[1])):
+            lines.append(
+                f"{name:<{width}} {len(durations):6d} {sum(durations):11.3f} "
+                f"{sum(durations) / len(durations):11.3f} {max(durations):11.3f}"
+            )
+
+        return "\n".join(lines)
+
+
+# Global tracer, meant to be accessed through `span` and `get_tracer`
+_tracer = Tracer()
+_null_span = contextlib.nullcontext()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def enable_tracing() -> Tracer:
+    _tracer.enabled = True
+    return _tracer
+
+
+def disable_tracing() -> None:
+    _tracer.enabled = False
+
+
+def span(name: str, **args: Any) -> contextlib.AbstractContextManager:
+    if not _tracer.enabled:
+        return _null_span
+
+    return _tracer.span(name, **args)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator recording every call of the decorated function as a span."""
+
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore
+
+    return decorator
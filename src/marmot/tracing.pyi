@@ -0,0 +1,34 @@
+import contextlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar, Union
+
+F = TypeVar("F", bound=Callable)
+
+@dataclass
+class Span:
+    name: str
+    start: int
+    duration: int = ...
+    pid: int = ...
+    tid: int = ...
+    args: dict = ...
+    def __init__(self, name, start, duration, pid, tid, args) -> None: ...
+
+class Tracer:
+    enabled: bool
+    spans: list[Span]
+    events: list[dict]
+    def __init__(self) -> None: ...
+    def span(self, name: str, **args: Any) -> contextlib.AbstractContextManager: ...
+    def clear(self) -> None: ...
+    def add_events(self, filename: Union[str, Path]) -> None: ...
+    def to_chrome_trace(self) -> dict: ...
+    def export_chrome_trace(self, filename: Union[str, Path]) -> None: ...
+    def summary(self) -> str: ...
+
+def get_tracer() -> Tracer: ...
+def enable_tracing() -> Tracer: ...
+def disable_tracing() -> None: ...
+def span(name: str, **args: Any) -> contextlib.AbstractContextManager: ...
+def traced(name: str) -> Callable[[F], F]: ...
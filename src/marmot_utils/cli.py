@@ -1,6 +1,13 @@
+from __future__ import annotations
+
+import contextlib
+from typing import Iterator, Optional
+
 import click
+from marmot.tracing import enable_tracing
 
 from .functions import *
+from .profiling import profile_models
 
 
 @click.group()
@@ -8,12 +15,87 @@ def main():
     pass
 
 
+def _limit_options(fn):
+    fn = click.option(
+        "--memory-limit",
+        type=int,
+        default=None,
+        help="Memory ceiling of the validation in MB (Linux only).",
+    )(fn)
+    fn = click.option(
+        "--call-timeout",
+        type=float,
+        default=None,
+        help="Time limit for a single model call in seconds.",
+    )(fn)
+    fn = click.option(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Time limit for the whole validation in seconds.",
+    )(fn)
+    return fn
+
+
+def _trace_option(fn):
+    return click.option(
+        "--trace",
+        type=click.Path(dir_okay=False),
+        default=None,
+        help="Write a Chrome trace of the pipeline to this file.",
+    )(fn)
+
+
+@contextlib.contextmanager
+def _tracing(trace: Optional[str]) -> Iterator[None]:
+    if trace is None:
+        yield
+        return
+
+    tracer = enable_tracing()
+    try:
+        yield
+    finally:
+        tracer.export_chrome_trace(trace)
+        click.echo(f"==> Trace written to {trace}")
+        click.echo(tracer.summary())
+
+
+@contextlib.contextmanager
+def _exit_on_error() -> Iterator[None]:
+    # Validation errors and timeouts are reported without a traceback
+    try:
+        yield
+    except RuntimeError as e:
+        click.echo(f"==> {e}", err=True)
+        raise SystemExit(1)
+
+
+def _to_bytes(megabytes: Optional[int]) -> Optional[int]:
+    return megabytes * 1024 * 1024 if megabytes is not None else None
+
+
 @main.command()
 @click.argument("path_to_model", type=click.Path(exists=True))
-def upload(path_to_model: str) -> None:
+@_limit_options
+@_trace_option
+def upload(
+    path_to_model: str,
+    timeout: Optional[float],
+    call_timeout: Optional[float],
+    memory_limit: Optional[int],
+    trace: Optional[str],
+) -> None:
     """Uploads a model to the model store"""
-    if validate_model(path_to_model, print=click.echo):
-        upload_model(path_to_model, print=click.echo)
+    with _exit_on_error(), _tracing(trace):
+        if validate_model(
+            path_to_model,
+            print=click.echo,
+            timeout=timeout,
+            call_timeout=call_timeout,
+            memory_limit=_to_bytes(memory_limit),
+        ):
+            upload_model(path_to_model, print=click.echo)
 
     click.echo(f"==> Done!")
 
@@ -21,8 +103,56 @@ def upload(path_to_model: str) -> None:
 @main.command()
 @click.argument("path_to_model", type=click.Path(exists=True))
 @click.option("--repo", type=str, default="")
-def validate(path_to_model: str, repo: str) -> None:
+@_limit_options
+@_trace_option
+def validate(
+    path_to_model: str,
+    repo: str,
+    timeout: Optional[float],
+    call_timeout: Optional[float],
+    memory_limit: Optional[int],
+    trace: Optional[str],
+) -> None:
     """Validate model"""
-    validate_model(
-        path_to_model, print=click.echo, local_repo=repo if repo != "" else None
+    with _exit_on_error(), _tracing(trace):
+        validate_model(
+            path_to_model,
+            print=click.echo,
+            local_repo=repo if repo != "" else None,
+            timeout=timeout,
+            call_timeout=call_timeout,
+            memory_limit=_to_bytes(memory_limit),
+        )
+
+
+@main.command()
+@click.argument("path_to_model", type=click.Path(exists=True))
+@click.option("--model", "model_ids", type=str, multiple=True)
+@click.option("--dataset", type=click.Path(exists=True), default=None)
+@click.option("--sampling", is_flag=True, default=False)
+@click.option("--interval", type=float, default=0.001)
+@click.option("--repeat", type=int, default=1)
+@click.option("--top", type=int, default=20)
+@click.option("--output-dir", type=str, default=".marmot-profiles")
+def profile(
+    path_to_model: str,
+    model_ids: tuple[str, ...],
+    dataset: Optional[str],
+    sampling: bool,
+    interval: float,
+    repeat: int,
+    top: int,
+    output_dir: str,
+) -> None:
+    """Profile the models registered by a model package"""
+    profile_models(
+        path_to_model,
+        model_ids=model_ids,
+        dataset=dataset,
+        sampling=sampling,
+        interval=interval,
+        repeat=repeat,
+        top=top,
+        output_dir=output_dir,
+        print=click.echo,
     )
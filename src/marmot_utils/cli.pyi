@@ -1,4 +1,30 @@
+from typing import Optional
+
 from .functions import *
 
 def main() -> None: ...
-def upload(path_to_model: str, repo: str) -> None: ...
+def upload(
+    path_to_model: str,
+    timeout: Optional[float],
+    call_timeout: Optional[float],
+    memory_limit: Optional[int],
+    trace: Optional[str],
+) -> None: ...
+def validate(
+    path_to_model: str,
+    repo: str,
+    timeout: Optional[float],
+    call_timeout: Optional[float],
+    memory_limit: Optional[int],
+    trace: Optional[str],
+) -> None: ...
+def profile(
+    path_to_model: str,
+    model_ids: tuple[str, ...],
+    dataset: Optional[str],
+    sampling: bool,
+    interval: float,
+    repeat: int,
+    top: int,
+    output_dir: str,
+) -> None: ...
@@ -1,6 +1,8 @@
 import importlib
 import os
+import py_compile
 import shutil
+import signal
 import subprocess
 import sys
 import zipfile
@@ -8,6 +10,7 @@ from pathlib import Path
 from typing import Callable, Optional
 
 import requests
+from marmot.tracing import get_tracer, span, traced
 
 _MARMOT_VALIDATION_VENV_NAME = ".marmot-validation-venv"
 _MARMOT_TMP_DIR = ".marmot-tmp"
@@ -96,24 +99,64 @@ def _install_dependencies(python: Path, requirements_file: Path) -> str:
     return out.stdout.strip()
 
 
-def _run_validation(python: Path, validation_script: Path, path_to_model: Path) -> str:
-    out = subprocess.run(
+def _run_validation(
+    python: Path,
+    validation_script: Path,
+    path_to_model: Path,
+    timeout: Optional[float] = None,
+    call_timeout: Optional[float] = None,
+    memory_limit: Optional[int] = None,
+) -> str:
+    options = []
+    trace_file = Path(_MARMOT_TMP_DIR).absolute() / "validation-trace.json"
+    if get_tracer().enabled:
+        # A trace left by an earlier run must not be merged if this one dies early
+        trace_file.parent.mkdir(parents=True, exist_ok=True)
+        if trace_file.exists():
+            trace_file.unlink()
+        options += ["--trace", str(trace_file)]
+    if call_timeout is not None:
+        options += ["--call-timeout", str(call_timeout)]
+    if memory_limit is not None:
+        options += ["--memory-limit", str(memory_limit)]
+
+    # Run in a session of its own so that model workers die with the validation
+    process = subprocess.Popen(
         [
             python,
             validation_script,
             path_to_model.parent.absolute(),
             path_to_model.stem,
+            *options,
         ],
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
         text=True,
+        start_new_session=os.name == "posix",
     )
 
-    if out.returncode != 0:
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+        stdout, _ = process.communicate()
+
         raise RuntimeError(
-            f"Error occurred during validation.\n{'='*80}\n{out.stderr}{'='*80}"
+            f"Validation did not finish within {timeout}s.\n{'='*80}\n{stdout}{'='*80}"
         )
 
-    return out.stdout.strip()
+    if get_tracer().enabled and trace_file.exists():
+        get_tracer().add_events(trace_file)
+
+    if process.returncode != 0:
+        raise RuntimeError(
+            f"Error occurred during validation.\n{'='*80}\n{stderr}{'='*80}"
+        )
+
+    return stdout.strip()
 
 
 def _compress_model(path_to_model: Path) -> Path:
@@ -122,7 +165,10 @@ def _compress_model(path_to_model: Path) -> Path:
 
     out_filename = tmp_path / f"{path_to_model.stem}.zip"
 
-    with zipfile.ZipFile(tmp_path / f"{path_to_model.stem}.zip", mode="w") as archive:
+    # The archive is imported directly (zipimport), so members are stored under the
+    # package name, sources ship with precompiled bytecode next to them and all other
+    # assets are stored uncompressed so that they can be memory-mapped
+    with zipfile.ZipFile(out_filename, mode="w") as archive:
         for file in path_to_model.glob("*"):
             if file.name == "__pycache__":
                 continue
@@ -130,15 +176,37 @@ def _compress_model(path_to_model: Path) -> Path:
             if file.suffix == ".pyc":
                 continue
 
-            archive.write(file)
+            arcname = f"{path_to_model.stem}/{file.name}"
+
+            if file.suffix == ".py":
+                archive.write(file, arcname, compress_type=zipfile.ZIP_DEFLATED)
+
+                bytecode = tmp_path / f"{file.stem}.pyc"
+                py_compile.compile(
+                    str(file),
+                    cfile=str(bytecode),
+                    dfile=arcname,
+                    doraise=True,
+                    invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+                )
+                archive.write(
+                    bytecode, f"{arcname}c", compress_type=zipfile.ZIP_DEFLATED
+                )
+                bytecode.unlink()
+            else:
+                archive.write(file, arcname)
 
     return out_filename
 
 
+@traced("validate_model")
 def validate_model(
     path_to_model: str,
     print: Callable = lambda *args: None,
     local_repo: Optional[Path] = None,
+    timeout: Optional[float] = None,
+    call_timeout: Optional[float] = None,
+    memory_limit: Optional[int] = None,
 ) -> bool:
     directory = Path(path_to_model)
     model_name = directory.stem
@@ -157,19 +225,30 @@ def validate_model(
     if not ok:
         print("===> Aborting, required files not found!")
 
-    venv_python = _create_validation_virtual_env()
+    with span("create venv"):
+        venv_python = _create_validation_virtual_env()
 
     # Install marmot repo in validation venv
-    _install_marmot(venv_python, local_repo=local_repo)
+    with span("install marmot"):
+        _install_marmot(venv_python, local_repo=local_repo)
 
     # Install user-defined dependencies in requirements.txt
     requirements_file = (directory / "requirements.txt").absolute()
-    _install_dependencies(venv_python, requirements_file)
+    with span("pip install"):
+        _install_dependencies(venv_python, requirements_file)
 
     # Validate model, all errors are properly handled
     # This block will not raise any error even if the model is not ok
     validation_script = (Path(__file__).parent / "validation_script.py").absolute()
-    out = _run_validation(venv_python, validation_script, directory)
+    with span("run validation"):
+        out = _run_validation(
+            venv_python,
+            validation_script,
+            directory,
+            timeout=timeout,
+            call_timeout=call_timeout,
+            memory_limit=memory_limit,
+        )
 
     print(out)
 
@@ -180,14 +259,17 @@ def validate_model(
     return True
 
 
+@traced("upload_model")
 def upload_model(path_to_model: str, print: Callable = lambda *args: None):
     directory = Path(path_to_model)
 
     print(f"==> Packing and compressing models...")
-    archive_fn = _compress_model(directory)
+    with span("compress"):
+        archive_fn = _compress_model(directory)
 
     print(f"==> Uploading models...")
-    requests.post(
-        f"http://{_MARMOT_MODELSTORE_API_IP}/marmot/models/{directory.stem}",
-        files={"file": archive_fn.open("rb")},
-    )
+    with span("upload"):
+        requests.post(
+            f"http://{_MARMOT_MODELSTORE_API_IP}/marmot/models/{directory.stem}",
+            files={"file": archive_fn.open("rb")},
+        )
@@ -3,5 +3,10 @@ from typing import Callable, Optional
 def cleanup() -> None: ...
 def upload_model(path_to_model: str, print: Callable = ...): ...
 def validate_model(
-    path_to_model: str, print: Callable = ..., local_repo: Optional[str] = None
+    path_to_model: str,
+    print: Callable = ...,
+    local_repo: Optional[str] = None,
+    timeout: Optional[float] = None,
+    call_timeout: Optional[float] = None,
+    memory_limit: Optional[int] = None,
 ): ...
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import copy
+import cProfile
+import importlib
+import io
+import pickle
+import pstats
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+import marmot
+from marmot.model import get_available_models
+
+_MARMOT_PROFILE_DIR = ".marmot-profiles"
+_MARMOT_PACKAGE_DIR = str(Path(marmot.__file__).parent)
+_COPY_MODULE_FILE = copy.__file__
+
+
+class SamplingProfiler:
+    """Periodically samples the stack of the thread that started it.
+
+    Collected stacks are kept in collapsed form (`outer;inner;leaf count`), which is
+    understood by most flame graph tools.
+
+    On POSIX, when started from the main thread and no other interval timer is
+    armed, samples are taken by a `SIGALRM` handler every `interval` seconds of wall
+    time (CPU-time timers tick too coarsely on many kernels). Otherwise a sampler
+    thread takes them, which needs the GIL: the switch interval is lowered to
+    `interval` while sampling so that pure Python code hands the GIL over often
+    enough.
+    """
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.elapsed = 0.0
+        self._target: Optional[int] = None
+        self._started: Optional[float] = None
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._timer = False
+        self._previous_handler: Any = None
+        self._switch_interval: Optional[float] = None
+
+    @property
+    def uses_timer(self) -> bool:
+        return (
+            hasattr(signal, "setitimer")
+            and threading.current_thread() is threading.main_thread()
+            and signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+        )
+
+    def enable(self) -> None:
+        self._target = threading.get_ident()
+        self._started = time.perf_counter()
+
+        if self.uses_timer:
+            self._timer = True
+            self._previous_handler = signal.signal(signal.SIGALRM, self._on_signal)
+            signal.setitimer(signal.ITIMER_REAL, self.interval, self.interval)
+            return
+
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._running.set()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def disable(self) -> None:
+        if self._timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._previous_handler)
+            self._timer = False
+
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        if self._switch_interval is not None:
+            sys.setswitchinterval(self._switch_interval)
+            self._switch_interval = None
+
+        if self._started is not None:
+            self.elapsed += time.perf_counter() - self._started
+            self._started = None
+
+    def _on_signal(self, signum: int, frame: Optional[FrameType]) -> None:
+        self._record(frame)
+
+    def _sample(self) -> None:
+        deadline = time.perf_counter()
+        while self._running.is_set():
+            self._record(sys._current_frames().get(self._target))  # type: ignore
+
+            # Sample on a fixed schedule rather than `interval` after each sample
+            deadline += self.interval
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+
+    def _record(self, frame: Optional[FrameType]) -> None:
+        stack = _collapse(frame)
+
+        # Skip samples taken while the profiled thread starts or stops sampling
+        if stack and not any(
+            function.startswith(("enable (", "disable (")) and __file__ in function
+            for function in stack
+        ):
+            self.stacks[stack] += 1
+
+    def dump_stats(self, filename: Path) -> None:
+        with open(filename, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+
+    def summary(self, top: int = 20) -> str:
+        total = sum(self.stacks.values())
+        own: Counter[str] = Counter()
+        cumulative: Counter[str] = Counter()
+
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for function in set(stack):
+                cumulative[function] += count
+
+        if total == 0:
+            return (
+                f"No samples taken in {self.elapsed * 1000:.1f}ms, the profiled code "
+                f"ran for less than the sampling interval of "
+                f"{self.interval * 1000:.1f}ms. Use --repeat or a larger --dataset."
+            )
+
+        lines = [
+            f"{total} samples in {self.elapsed * 1000:.1f}ms "
+            f"(one every {1000 * self.elapsed / total:.1f}ms, "
+            f"requested every {self.interval * 1000:.1f}ms)",
+            "",
+        ]
+        lines.append(f"{'own %':>8} {'cum %':>8}  function")
+        for function, count in own.most_common(top):
+            lines.append(
+                f"{100 * count / total:8.1f} {100 * cumulative[function] / total:8.1f}"
+                f"  {function}"
+            )
+
+        return "\n".join(lines)
+
+
+def _collapse(frame: Optional[FrameType]) -> tuple[str, ...]:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+
+    return tuple(reversed(stack))
+
+
+def _marmot_overhead(stats: pstats.Stats) -> str:
+    lines = [f"{'ncalls':>8} {'tottime':>10} {'cumtime':>10}  function"]
+
+    entries = [
+        (func, stat)
+        for func, stat in stats.stats.items()  # type: ignore
+        if func[0].startswith(_MARMOT_PACKAGE_DIR)
+        or (func[0] == _COPY_MODULE_FILE and func[2] == "deepcopy")
+    ]
+    entries = sorted(entries, key=lambda entry: entry[1][3], reverse=True)
+
+    for (filename, lineno, name), (_, ncalls, tottime, cumtime, _) in entries:
+        location = f"{Path(filename).name}:{lineno}" if lineno else filename
+        lines.append(
+            f"{ncalls:8d} {tottime:10.6f} {cumtime:10.6f}  {name} ({location})"
+        )
+
+    return "\n".join(lines)
+
+
+def _load_dataset(dataset: Optional[Path], model: marmot.Model) -> Sequence[Any]:
+    if dataset is None:
+        return [model.dummy_input]
+
+    with open(dataset, "rb") as f:
+        inputs = pickle.load(f)
+
+    if not isinstance(inputs, Sequence):
+        raise TypeError(f"The dataset in {dataset} must be a sequence of model inputs")
+
+    return inputs
+
+
+def _profile_single_model(
+    model_id: str,
+    profiler: Any,
+    dataset: Optional[Path],
+    repeat: int,
+) -> None:
+    # Construction is profiled together with inference so that the wrapper layers
+    # (`load`, kwargs deepcopy, `__call__`) show up in the report
+    profiler.enable()
+    try:
+        model = marmot.load(model_id)
+    finally:
+        profiler.disable()
+
+    inputs = _load_dataset(dataset, model)
+
+    profiler.enable()
+    try:
+        for _ in range(repeat):
+            for x in inputs:
+                model(x)
+    finally:
+        profiler.disable()
+
+
+def profile_models(
+    path_to_model: str,
+    model_ids: Iterable[str] = (),
+    dataset: Optional[str] = None,
+    sampling: bool = False,
+    interval: float = 0.001,
+    repeat: int = 1,
+    top: int = 20,
+    output_dir: str = _MARMOT_PROFILE_DIR,
+    print: Callable = lambda *args: None,
+) -> dict[str, Path]:
+    directory = Path(path_to_model).absolute()
+    out_path = Path(output_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+
+    print(
+        f"==> Importing models from `\033[1m{directory.stem}\033[0m` "
+        f"({directory})..."
+    )
+    sys.path.insert(0, str(directory.parent))
+    importlib.import_module(directory.stem)
+
+    available = get_available_models()
+    selected = list(model_ids) or available
+    missing = [model_id for model_id in selected if model_id not in available]
+    if missing:
+        raise ValueError(
+            f"Models {missing} are not registered by `{directory.stem}`. "
+            f"Available models: {available}"
+        )
+
+    reports: dict[str, Path] = {}
+    for model_id in selected:
+        print(f"==> Profiling model `{model_id}`")
+
+        profiler: Any = SamplingProfiler(interval) if sampling else cProfile.Profile()
+        _profile_single_model(
+            model_id, profiler, Path(dataset) if dataset else None, repeat
+        )
+
+        stem = model_id.replace("/", "__")
+        if sampling:
+            profile_file = out_path / f"{stem}.folded"
+            summary = profiler.summary(top)
+        else:
+            profile_file = out_path / f"{stem}.prof"
+            stream = io.StringIO()
+            stats = pstats.Stats(profiler, stream=stream)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+            summary = (
+                f"{stream.getvalue().strip()}\n\n"
+                f"marmot wrapper overhead:\n{_marmot_overhead(stats)}"
+            )
+
+        profiler.dump_stats(profile_file)
+
+        report_file = out_path / f"{stem}.txt"
+        report_file.write_text(summary + "\n")
+        reports[model_id] = report_file
+
+        print(summary)
+        print(f"  \033[32m\033[1m✔\033[0m\033[0m profile written to {profile_file}")
+
+    return reports
@@ -0,0 +1,25 @@
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+class SamplingProfiler:
+    interval: float
+    elapsed: float
+    def __init__(self, interval: float = 0.001) -> None: ...
+    @property
+    def uses_timer(self) -> bool: ...
+    def enable(self) -> None: ...
+    def disable(self) -> None: ...
+    def dump_stats(self, filename: Path) -> None: ...
+    def summary(self, top: int = 20) -> str: ...
+
+def profile_models(
+    path_to_model: str,
+    model_ids: Iterable[str] = (),
+    dataset: Optional[str] = None,
+    sampling: bool = False,
+    interval: float = 0.001,
+    repeat: int = 1,
+    top: int = 20,
+    output_dir: str = ...,
+    print: Callable = ...,
+) -> dict[str, Path]: ...
@@ -1,19 +1,44 @@
+import argparse
 import importlib
 import sys
 from pathlib import Path
 
 import marmot  # type: ignore
 from marmot.model import get_available_models
+from marmot.model.limits import set_memory_limit
+from marmot.tracing import enable_tracing, span
 
 
 def main() -> None:
-    _, path_to_model, model_name, *_ = sys.argv
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path_to_model")
+    parser.add_argument("model_name")
+    parser.add_argument("--call-timeout", type=float, default=None)
+    parser.add_argument("--memory-limit", type=int, default=None)
+    parser.add_argument("--trace", type=str, default=None)
+    args = parser.parse_args()
+
+    if args.trace is None:
+        validate(args)
+        return
+
+    tracer = enable_tracing()
+    try:
+        validate(args)
+    finally:
+        tracer.export_chrome_trace(args.trace)
+
+
+def validate(args: argparse.Namespace) -> None:
+    path_to_model, model_name = args.path_to_model, args.model_name
+    set_memory_limit(args.memory_limit)
 
     assert Path(path_to_model).exists()
     sys.path.insert(0, path_to_model)
 
     try:
-        importlib.import_module(model_name)
+        with span("import module", module=model_name):
+            importlib.import_module(model_name)
     except Exception as e:
         print(
             "\033[31mFatal error: \033[0m Failed to load module. Please check if "
@@ -39,7 +64,10 @@ def main() -> None:
 
             continue
 
-        ok &= model.validate(verbose=True)
+        with span("validate model", id=model_name):
+            ok &= model.validate(
+                verbose=True, timeout=args.call_timeout, memory_limit=args.memory_limit
+            )
 
     if not ok:
         print(
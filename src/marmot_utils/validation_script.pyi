@@ -1 +1,4 @@
+import argparse
+
 def main() -> None: ...
+def validate(args: argparse.Namespace) -> None: ...
@@ -0,0 +1,19 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from marmot.model import registration
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "examples"))
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    """Restores the global model registry after every test."""
+    saved = dict(registration._registry)
+    yield registration._registry
+
+    registration._registry.clear()
+    registration._registry.update(saved)
+    registration._invalidate_caches()
@@ -0,0 +1,138 @@
+import http.server
+import io
+import sys
+import threading
+import zipfile
+
+import pytest
+
+import marmot
+from marmot.model import registration
+
+MODEL_SOURCE = """
+import marmot
+
+
+class Constant(marmot.Model[float, float]):
+    _id = "constant-v1"
+
+    def __init__(self):
+        super().__init__()
+        with marmot.open_asset(__package__, "weights.bin") as f:
+            self.value = float(f.read())
+
+    @property
+    def dummy_input(self):
+        return 0.0
+
+    @property
+    def dummy_output(self):
+        return self.value
+
+    def get_output(self, x):
+        return self.value
+
+
+Constant.register_model()
+"""
+
+
+def _model_archive(package: str, value: str) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr(f"{package}/__init__.py", MODEL_SOURCE)
+        archive.writestr(f"{package}/weights.bin", value)
+
+    return buffer.getvalue()
+
+
+class ModelStore(http.server.BaseHTTPRequestHandler):
+    archives: dict = {}
+    requests: list = []
+
+    def do_GET(self):
+        module = self.path.rsplit("/", 1)[-1]
+        data, etag = self.archives[module]
+        self.requests.append(self.headers.get("If-None-Match"))
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def model_store(tmp_path, monkeypatch):
+    server = http.server.HTTPServer(("127.0.0.1", 0), ModelStore)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    monkeypatch.setattr(
+        registration, "_MODEL_STORE_URL", f"http://127.0.0.1:{server.server_port}"
+    )
+    monkeypatch.setattr(registration, "_MODEL_ARCHIVE_DIR", str(tmp_path))
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    ModelStore.requests.clear()
+
+    yield ModelStore.archives
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_load_from_archive_without_extraction(model_store, tmp_path):
+    model_store["archived"] = (_model_archive("archived", "1.5"), '"v1"')
+
+    model = marmot.load("archived:constant-v1")
+
+    assert model(0.0) == 1.5
+    (archive,) = (tmp_path / "archived").glob("*.zip")
+    assert {p.name for p in archive.parent.iterdir()} == {
+        archive.name,
+        "current.json",
+    }
+    assert sys.modules["archived"].__file__.startswith(str(archive))
+
+
+def test_archive_versions_are_kept_side_by_side(model_store, tmp_path):
+    model_store["refreshed"] = (_model_archive("refreshed", "1.0"), '"v1"')
+    first = registration._download_model_archive("refreshed", tmp_path)
+    assert registration._download_model_archive("refreshed", tmp_path) == first
+
+    model_store["refreshed"] = (_model_archive("refreshed", "2.0"), '"v2"')
+    second = registration._download_model_archive("refreshed", tmp_path)
+
+    assert ModelStore.requests == [None, '"v1"', '"v1"']
+    assert first != second
+    for filename, weights in ((first, b"1.0"), (second, b"2.0")):
+        with zipfile.ZipFile(filename) as archive:
+            assert archive.read("refreshed/weights.bin") == weights
+    assert list(tmp_path.glob("*.part")) == []
+
+
+def test_newest_archive_replaces_older_ones_on_sys_path(model_store, tmp_path):
+    model_store["newest"] = (_model_archive("newest", "1.0"), '"v1"')
+    registration._add_model_archive("newest")
+    model_store["newest"] = (_model_archive("newest", "2.0"), '"v2"')
+    registration._add_model_archive("newest")
+
+    (archive,) = [path for path in sys.path if str(tmp_path) in path]
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.read("newest/weights.bin") == b"2.0"
+
+
+def test_assets_of_archived_package(model_store):
+    model_store["assets"] = (_model_archive("assets", "2.5"), '"v1"')
+    marmot.load("assets:constant-v1")
+
+    with marmot.open_asset("assets", "weights.bin") as f:
+        assert f.read() == b"2.5"
+    assert bytes(marmot.map_asset("assets", "weights.bin")) == b"2.5"
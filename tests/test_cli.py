@@ -0,0 +1,47 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from marmot.tracing import disable_tracing, enable_tracing
+from marmot_utils import cli, functions
+
+
+def _time_out(*args, **kwargs):
+    raise RuntimeError("Validation did not finish within 1.0s.")
+
+
+def test_validation_errors_exit_without_traceback(monkeypatch, tmp_path):
+    monkeypatch.setattr(cli, "validate_model", _time_out)
+    runner = CliRunner()
+
+    for command in ("validate", "upload"):
+        result = runner.invoke(cli.main, [command, str(tmp_path), "--timeout", "1"])
+
+        assert result.exit_code == 1
+        assert "Validation did not finish within 1.0s." in result.output
+        assert "Traceback" not in result.output
+
+
+def test_stale_validation_trace_is_not_merged(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    trace_file = tmp_path / ".marmot-tmp" / "validation-trace.json"
+    trace_file.parent.mkdir()
+    trace_file.write_text(json.dumps({"traceEvents": [{"name": "stale"}]}))
+
+    script = tmp_path / "crash.py"
+    script.write_text("import os, signal\nos.kill(os.getpid(), signal.SIGKILL)\n")
+
+    tracer = enable_tracing()
+    try:
+        with pytest.raises(RuntimeError, match="Error occurred during validation"):
+            functions._run_validation(Path(sys.executable), script, tmp_path / "model")
+        events = tracer.to_chrome_trace()["traceEvents"]
+    finally:
+        disable_tracing()
+        tracer.clear()
+
+    assert not trace_file.exists()
+    assert "stale" not in [event["name"] for event in events]
@@ -0,0 +1,104 @@
+import copy
+import gc
+import pickle
+import threading
+import time
+
+import arithmetic  # noqa: F401  registers the example models
+import marmot
+from marmot import ConcurrencyMode
+from arithmetic.main import BatchMean, RecursiveMean
+
+
+class PerThreadMean(BatchMean):
+    _id = "test/per-thread-mean-v1"
+    _concurrency = ConcurrencyMode.PER_THREAD
+
+
+def test_models_can_be_pickled_and_copied():
+    model = marmot.load("mean-v1")
+
+    for clone in (pickle.loads(pickle.dumps(model)), copy.deepcopy(model)):
+        assert clone([1.0, 3.0]) == 2.0
+        assert clone._call_lock is not model._call_lock
+
+
+def test_thread_local_model_releases_finished_threads():
+    PerThreadMean.register_model()
+    model = marmot.load_shared("test/per-thread-mean-v1")
+
+    threads = [threading.Thread(target=model, args=([1.0],)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+        thread.join()
+    gc.collect()
+
+    assert len(model.instances) == 1
+    assert model([1.0, 3.0]) == 2.0
+
+
+class CheckedRecursiveMean(RecursiveMean):
+    _id = "test/checked-recursive-mean-v1"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.active = 0
+        self.overlapped = False
+
+    def _enter(self) -> None:
+        self.active += 1
+        self.overlapped |= self.active > 1
+        time.sleep(0.001)
+        self.active -= 1
+
+    def update(self, state, x):
+        self._enter()
+        return super().update(state, x)
+
+    def finalize(self, state):
+        self._enter()
+        return super().finalize(state)
+
+
+def test_stream_holds_the_model_lock():
+    model = CheckedRecursiveMean()
+
+    def run() -> None:
+        assert list(model.stream([[1.0], [3.0]] * 10))[-1] == 2.0
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not model.overlapped
+
+
+class UnlockedMean(CheckedRecursiveMean):
+    _id = "test/unlocked-mean-v1"
+
+    def __init__(self) -> None:
+        self.active = 0
+        self.overlapped = False
+
+    def get_output(self, x):
+        self._enter()
+        return super().get_output(x)
+
+
+def test_models_without_super_init_are_locked():
+    UnlockedMean.register_model()
+    model = marmot.load_shared("test/unlocked-mean-v1")
+
+    threads = [
+        threading.Thread(target=lambda: [model([1.0, 3.0]) for _ in range(10)])
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not model.overlapped
+    assert list(model.stream([[1.0], [3.0]]))[-1] == 2.0
@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+
+import pytest
+
+from marmot.model.limits import ModelMemoryError, ModelTimeoutError, call_with_limits
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def _allocate(size):
+    return len(bytearray(size))
+
+
+def _crash():
+    os._exit(3)
+
+
+def _fail():
+    raise ValueError("bad input")
+
+
+def test_result_is_returned():
+    assert call_with_limits(_sleep, 0.0, timeout=5) == 0.0
+
+
+def test_timeout():
+    start = time.perf_counter()
+    with pytest.raises(ModelTimeoutError, match="within 0.2s"):
+        call_with_limits(_sleep, 10, timeout=0.2)
+
+    assert time.perf_counter() - start < 5
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux only")
+def test_memory_limit():
+    # The limit caps the address space of the forked worker, which starts out as
+    # large as the one of the test process
+    with open("/proc/self/statm") as f:
+        address_space = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    memory_limit = address_space + 2**28
+
+    with pytest.raises(ModelMemoryError, match="memory limit"):
+        call_with_limits(_allocate, 2**29, memory_limit=memory_limit)
+
+    assert call_with_limits(_allocate, 2**20, memory_limit=memory_limit) == 2**20
+
+
+def test_worker_crash():
+    with pytest.raises(RuntimeError, match="exit code 3"):
+        call_with_limits(_crash, timeout=5)
+
+
+def test_model_errors_are_reraised():
+    with pytest.raises(ValueError, match="bad input"):
+        call_with_limits(_fail, timeout=5)
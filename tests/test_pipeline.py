@@ -0,0 +1,116 @@
+import gc
+import threading
+
+import marmot
+from marmot import ConcurrencyMode, Node, Pipeline
+
+
+class Add(marmot.Model[float, float]):
+    _id = "test/add-v1"
+    _concurrency = ConcurrencyMode.REENTRANT
+
+    @property
+    def dummy_input(self) -> float:
+        return 1.0
+
+    @property
+    def dummy_output(self) -> float:
+        return 2.0
+
+    def get_output(self, x: float) -> float:
+        return x + 1
+
+
+class Inner(Pipeline):
+    _id = "test/inner-v1"
+    _nodes = {"first": Node("test/add-v1"), "second": Node("test/add-v1", ["first"])}
+    _outputs = "second"
+
+
+class Outer(Pipeline):
+    _id = "test/outer-v1"
+    _nodes = {"inner": Node("test/inner-v1"), "add": Node("test/add-v1", ["inner"])}
+    _outputs = ("inner", "add")
+
+
+def _within(seconds, fn):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(fn()), daemon=True)
+    thread.start()
+    thread.join(seconds)
+
+    assert not thread.is_alive(), "deadlocked"
+    return result[0]
+
+
+def test_nested_pipeline():
+    Add.register_model()
+    Inner.register_model()
+    _within(5, Outer.register_model)
+
+    model = _within(5, lambda: marmot.load("test/outer-v1"))
+    assert model(1.0) == {"inner": 3.0, "add": 4.0}
+
+
+def test_load_shared_pipeline():
+    Add.register_model()
+    Inner.register_model()
+
+    model = _within(5, lambda: marmot.load_shared("test/inner-v1"))
+    assert model is marmot.load_shared("test/inner-v1")
+    assert model(1.0) == 3.0
+
+
+def test_pipeline_only_evaluates_required_nodes():
+    Add.register_model()
+    Inner.register_model()
+    Outer.register_model()
+
+    model = marmot.load("test/outer-v1")
+    assert model.evaluate(1.0, outputs=["inner"]).keys() == {"inner"}
+
+
+class Fork(Pipeline):
+    _id = "test/fork-v1"
+    _nodes = {"left": Node("test/add-v1"), "right": Node("test/add-v1")}
+    _outputs = ("left", "right")
+
+
+def test_single_output_name():
+    Add.register_model()
+    Inner.register_model()
+    Outer.register_model()
+
+    model = marmot.load("test/outer-v1")
+    assert model(1.0, outputs="inner") == 3.0
+    assert model(1.0, outputs=["inner"]) == {"inner": 3.0}
+    assert model.evaluate(1.0, outputs="inner").keys() == {"inner"}
+
+
+def _workers(prefix):
+    return [t for t in threading.enumerate() if t.name.startswith(prefix)]
+
+
+def _wait_for_exit(threads):
+    for thread in threads:
+        thread.join(5)
+    return [thread for thread in threads if thread.is_alive()]
+
+
+def test_pipeline_workers_are_shut_down():
+    Add.register_model()
+    Fork.register_model()
+
+    model = marmot.load("test/fork-v1")
+    assert model(1.0) == {"left": 2.0, "right": 2.0}
+    workers = _workers("test/fork-v1")
+    assert workers
+
+    model.close()
+    assert _wait_for_exit(workers) == []
+    assert model(1.0) == {"left": 2.0, "right": 2.0}
+
+    workers = _workers("test/fork-v1")
+    del model
+    gc.collect()
+    assert _wait_for_exit(workers) == []
@@ -0,0 +1,53 @@
+import signal
+import sys
+import threading
+import time
+
+import pytest
+
+from marmot_utils.profiling import SamplingProfiler
+
+
+def _busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(i * i for i in range(1000))
+
+
+def _profile(profiler: SamplingProfiler) -> None:
+    for _ in range(2):
+        profiler.enable()
+        try:
+            _busy(0.1)
+        finally:
+            profiler.disable()
+
+
+@pytest.mark.parametrize("in_thread", [False, True])
+def test_sampling_keeps_up_with_pure_python_code(in_thread):
+    profiler = SamplingProfiler(interval=0.001)
+    handler = signal.getsignal(signal.SIGALRM)
+    switch_interval = sys.getswitchinterval()
+
+    if in_thread:
+        thread = threading.Thread(target=_profile, args=(profiler,))
+        thread.start()
+        thread.join()
+    else:
+        _profile(profiler)
+
+    total = sum(profiler.stacks.values())
+    assert total > 0.3 * profiler.elapsed / profiler.interval
+    assert profiler.summary().startswith(
+        f"{total} samples in {profiler.elapsed * 1000:.1f}ms"
+    )
+    assert signal.getsignal(signal.SIGALRM) is handler
+    assert sys.getswitchinterval() == switch_interval
+
+
+def test_summary_without_samples():
+    profiler = SamplingProfiler(interval=1.0)
+    profiler.enable()
+    profiler.disable()
+
+    assert profiler.summary().startswith("No samples taken")
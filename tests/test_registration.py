@@ -0,0 +1,76 @@
+import sys
+
+import arithmetic  # noqa: F401  registers the example models
+import marmot
+from arithmetic.main import BatchMean, RecursiveMean
+from marmot.model.registration import register
+from marmot.tracing import disable_tracing, enable_tracing, get_tracer
+
+
+def create_model(**kwargs):
+    return BatchMean()
+
+
+def test_loaded_models_get_their_own_spec():
+    first, second = marmot.load("mean-v1"), marmot.load("mean-v1")
+
+    assert first.spec is not second.spec
+    first.spec.kwargs = {"changed": True}
+    assert second.spec.kwargs == {}
+    assert marmot.load("mean-v1").spec.version == 1
+
+
+def test_register_reloads_entry_points(monkeypatch):
+    register("test/entry-point-v1", f"{__name__}:create_model")
+    assert isinstance(marmot.load("test/entry-point-v1"), BatchMean)
+
+    monkeypatch.setattr(sys.modules[__name__], "create_model", lambda: RecursiveMean())
+    register("test/entry-point-v1", f"{__name__}:create_model")
+    assert isinstance(marmot.load("test/entry-point-v1"), RecursiveMean)
+
+
+class ScaledMean(BatchMean):
+    _id = "test/scaled-mean-v1"
+
+    def __init__(self, warmup: float = 1.0) -> None:
+        super().__init__()
+        self.scale = warmup
+
+    def get_output(self, x):
+        return self.scale * super().get_output(x)
+
+
+def test_load_passes_warmup_kwarg_to_the_model():
+    register("test/scaled-mean-v1", ScaledMean)
+
+    model = marmot.load("test/scaled-mean-v1", warmup=2.0)
+    assert model([1.0, 3.0]) == 4.0 and model.warmup_report is None
+
+    model = marmot.load("test/scaled-mean-v1", warmup_options={"max_iterations": 5})
+    assert model.warmup_report is not None and model.warmup_report.iterations <= 5
+
+
+def test_register_keeps_unrelated_shared_models():
+    shared = marmot.load_shared("mean-v1")
+
+    register("test/unrelated-v1", create_model)
+    assert marmot.load_shared("mean-v1") is shared
+
+    register("mean-v1", create_model)
+    assert marmot.load_shared("mean-v1") is not shared
+
+
+def test_load_spans_are_only_recorded_when_tracing():
+    get_tracer().clear()
+    marmot.load("mean-v1")
+    assert get_tracer().spans == []
+
+    tracer = enable_tracing()
+    try:
+        marmot.load("mean-v1")
+    finally:
+        disable_tracing()
+        spans = [span.name for span in tracer.spans]
+        tracer.clear()
+
+    assert spans == ["find spec", "construct model", "load"]
@@ -0,0 +1,143 @@
+import csv
+import gzip
+import json
+import zipfile
+
+import pytest
+
+import arithmetic  # noqa: F401  registers the example models
+import marmot
+from marmot.sinks import ArrowSink, CsvSink, NpySink
+
+
+@pytest.fixture
+def model():
+    return marmot.load("mean-v2")
+
+
+def test_csv_sink_round_trip(model, tmp_path):
+    path = tmp_path / "predictions.csv.gz"
+
+    with CsvSink(path, model=model, chunk_size=2) as sink:
+        assert sink.write_many(map(model, [[1.0, 2.0], [3.0], [4.0, 6.0]])) == 3
+        assert sink.write_many(model.stream([[1.0], [3.0]])) == 2
+
+    with gzip.open(path, "rt", newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    assert [row["index"] for row in rows] == ["0", "1", "2", "3", "4"]
+    assert [float(row["prediction"]) for row in rows] == [1.5, 3.0, 5.0, 1.0, 2.0]
+    assert {(row["model_id"], row["model_version"]) for row in rows} == {
+        ("mean-v2", "2")
+    }
+
+
+def test_csv_sink_columns_from_dict_predictions(tmp_path):
+    path = tmp_path / "predictions.csv"
+
+    with CsvSink(path, model_id="pipeline") as sink:
+        sink.write({"a": 1, "b": 2})
+        with pytest.raises(ValueError):
+            sink.write({"a": 1})
+
+    with open(path, newline="") as f:
+        assert list(csv.reader(f)) == [
+            ["model_id", "model_version", "index", "a", "b"],
+            ["pipeline", "", "0", "1", "2"],
+        ]
+
+
+def test_sink_reports_writer_errors(tmp_path):
+    sink = CsvSink(tmp_path / "missing" / "predictions.csv", chunk_size=1)
+
+    with pytest.raises(RuntimeError, match="Writing predictions"):
+        sink.write_many(range(10))
+        sink.close()
+
+
+def test_sink_keeps_failing_after_writer_error(tmp_path):
+    sink = CsvSink(tmp_path / "missing" / "predictions.csv", chunk_size=1)
+    sink._writer.join(timeout=5)
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="Writing predictions"):
+            sink.write(1)
+        with pytest.raises(RuntimeError, match="Writing predictions"):
+            sink.close()
+
+    assert sink.count == 0
+
+
+def test_sink_rejects_writes_after_close(tmp_path):
+    sink = CsvSink(tmp_path / "predictions.csv")
+    sink.close()
+
+    with pytest.raises(RuntimeError, match="closed"):
+        sink.write(1)
+
+
+def test_npy_sink_round_trip(model, tmp_path):
+    np = pytest.importorskip("numpy")
+    path = tmp_path / "predictions.npz"
+
+    with NpySink(path, model=model, chunk_size=2) as sink:
+        sink.write_many(map(model, [[1.0, 2.0], [3.0], [4.0, 6.0]]))
+
+    with zipfile.ZipFile(path) as archive:
+        metadata = json.loads(archive.read("metadata.json"))
+    assert metadata["model_id"] == "mean-v2" and metadata["model_version"] == 2
+    assert [(c["start"], c["rows"]) for c in metadata["chunks"]] == [(0, 2), (2, 1)]
+
+    arrays = np.load(path)
+    values = [arrays[f"{c['name']}/prediction"] for c in metadata["chunks"]]
+    assert np.concatenate(values).tolist() == [1.5, 3.0, 5.0]
+
+
+def test_arrow_sink_round_trip_with_mixed_types(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    path = tmp_path / "predictions.arrow"
+
+    with ArrowSink(path, model_id="mean-v2", model_version=2, chunk_size=2) as sink:
+        sink.write_many([1, 2, 3.5, None, 5])
+
+    with pa.memory_map(str(path)) as source:
+        table = pa.ipc.open_file(source).read_all()
+
+    assert table.column("prediction").to_pylist() == [1.0, 2.0, 3.5, None, 5.0]
+    assert table.column("index").to_pylist() == [0, 1, 2, 3, 4]
+    assert set(table.column("model_id").to_pylist()) == {"mean-v2"}
+    assert table.schema.metadata[b"model_version"] == b"2"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def _read_arrow(path):
+    pa = pytest.importorskip("pyarrow")
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def test_arrow_sink_keeps_integer_columns(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    path = tmp_path / "predictions.arrow"
+    labels = [2**60 + 1, 3, 4, 2**62 + 7, 5]
+
+    with ArrowSink(path, model_id="classifier-v1", chunk_size=2) as sink:
+        sink.write_many({"label": label, "score": 0.5} for label in labels)
+
+    table = _read_arrow(path)
+    assert table.schema.field("label").type == pa.int64()
+    assert table.column("label").to_pylist() == labels
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_arrow_sink_with_explicit_schema(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    path = tmp_path / "predictions.arrow"
+    schema = pa.schema([pa.field("prediction", pa.float32())])
+
+    with ArrowSink(path, model_id="mean-v2", schema=schema, chunk_size=2) as sink:
+        sink.write_many([None, None, 1, 2.5])
+
+    table = _read_arrow(path)
+    assert table.schema.field("prediction").type == pa.float32()
+    assert table.column("prediction").to_pylist() == [None, None, 1.0, 2.5]
@@ -0,0 +1,33 @@
+import marmot
+from marmot.tracing import disable_tracing, enable_tracing
+
+
+class NoSuperInit(marmot.Model[float, float]):
+    _id = "test/no-super-init-v1"
+
+    def __init__(self) -> None:
+        self.offset = 1.0
+
+    @property
+    def dummy_input(self) -> float:
+        return 1.0
+
+    @property
+    def dummy_output(self) -> float:
+        return 2.0
+
+    def get_output(self, x: float) -> float:
+        return x + self.offset
+
+
+def test_validate_model_without_super_init():
+    assert NoSuperInit().validate()
+
+
+def test_validate_model_without_super_init_while_tracing():
+    tracer = enable_tracing()
+    try:
+        assert NoSuperInit().validate()
+    finally:
+        disable_tracing()
+        tracer.clear()
@@ -0,0 +1,85 @@
+import types
+
+import pytest
+
+import arithmetic  # noqa: F401  registers the example models
+import marmot
+from arithmetic.main import BatchMean
+from marmot.model import core
+
+
+class ScriptedLatency(BatchMean):
+    _id = "test/scripted-latency-v1"
+
+    def __init__(self, latencies=(1.0,)) -> None:
+        super().__init__()
+        self.latencies = list(latencies)
+        self.calls = 0
+
+    def get_output(self, x):
+        # Advance the fake clock by the scripted latency of this call
+        latency = self.latencies[min(self.calls, len(self.latencies) - 1)]
+        self.calls += 1
+        core.time.now += latency
+        return super().get_output(x)
+
+
+@pytest.fixture(autouse=True)
+def fake_clock(monkeypatch):
+    clock = types.SimpleNamespace(now=0.0)
+    clock.perf_counter = lambda: clock.now
+    monkeypatch.setattr(core, "time", clock)
+
+
+def test_model_becomes_ready_once_latency_stabilizes():
+    model = ScriptedLatency([5.0, 2.0, 1.0, 1.05, 0.98, 1.0])
+    assert not model.is_ready
+
+    report = model.warmup(iterations=3, window=3, tolerance=0.1)
+
+    assert report.stabilized and model.is_ready
+    assert report.latencies == pytest.approx([5.0, 2.0, 1.0, 1.05, 0.98])
+    assert report.first_latency == 5.0
+    assert report.stable_latency == 1.0
+
+
+def test_model_stays_not_ready_after_max_iterations():
+    model = ScriptedLatency([1.0, 2.0] * 10)
+
+    report = model.warmup(max_iterations=8)
+
+    assert not report.stabilized and not model.is_ready
+    assert report.iterations == 8 and model.calls == 8
+
+
+def test_warmup_measures_the_mean_latency_of_a_batch():
+    model = ScriptedLatency([1.0, 2.0] * 10)
+
+    report = model.warmup(batch_size=2)
+
+    assert report.stabilized and model.calls == 6
+    assert report.latencies == [1.5] * 3
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"iterations": 0},
+        {"iterations": 5, "max_iterations": 4},
+        {"batch_size": 0},
+        {"window": 0},
+    ],
+)
+def test_warmup_rejects_bad_arguments(kwargs):
+    with pytest.raises(ValueError):
+        ScriptedLatency().warmup(**kwargs)
+
+
+def test_load_warms_up_with_default_options():
+    ScriptedLatency.register_model()
+
+    assert marmot.load("test/scripted-latency-v1").warmup_report is None
+
+    model = marmot.load("test/scripted-latency-v1", warmup_options=True)
+    assert model.is_ready
+    assert model.warmup_report.iterations == 3